@@ -0,0 +1,68 @@
+"""
+Catalog lookup microbenchmark
+Cost of id, category and language lookups as scans over plain lists of
+dicts (the previous implementation) versus the prebuilt catalog indexes.
+
+    python benchmarks/bench_catalog.py [number]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import catalog
+
+BIBLE_VERSIONS = [dict(r) for r in catalog.get_all_versions()]
+ALL_FONTS = [dict(r) for r in catalog.get_all_fonts()]
+ALL_COLORS = [dict(r) for r in catalog.get_all_colors()]
+
+
+def scan_by_id(records, record_id):
+    for r in records:
+        if r["id"] == record_id:
+            return r
+    return None
+
+
+def scan_languages():
+    languages = {}
+    for v in BIBLE_VERSIONS:
+        if v["language_code"] not in languages:
+            languages[v["language_code"]] = v["language"]
+    return languages
+
+
+CASES = [
+    ("color by id (last)",
+     lambda: scan_by_id(ALL_COLORS, ALL_COLORS[-1]["id"]),
+     lambda: catalog.get_color_by_id(ALL_COLORS[-1]["id"])),
+    ("font by id (last)",
+     lambda: scan_by_id(ALL_FONTS, ALL_FONTS[-1]["id"]),
+     lambda: catalog.get_font_by_id(ALL_FONTS[-1]["id"])),
+    ("version by id (last)",
+     lambda: scan_by_id(BIBLE_VERSIONS, BIBLE_VERSIONS[-1]["id"]),
+     lambda: catalog.get_version_by_id(BIBLE_VERSIONS[-1]["id"])),
+    ("fonts by category",
+     lambda: [f for f in ALL_FONTS if f["category"] == "serif"],
+     lambda: catalog.get_fonts_by_category("serif")),
+    ("colors by category",
+     lambda: [c for c in ALL_COLORS if c["category"] == "warm"],
+     lambda: catalog.get_colors_by_category("warm")),
+    ("versions by language",
+     lambda: [v for v in BIBLE_VERSIONS if v["language_code"] == "en"],
+     lambda: catalog.get_versions_by_language("en")),
+    ("available languages", scan_languages, catalog.get_available_languages),
+]
+
+
+def main(number: int = 100000) -> None:
+    print(f"{'lookup':<24}{'scan (us)':>12}{'catalog (us)':>14}{'speedup':>10}")
+    for name, before, after in CASES:
+        scan = min(timeit.repeat(before, number=number, repeat=3)) / number * 1e6
+        indexed = min(timeit.repeat(after, number=number, repeat=3)) / number * 1e6
+        print(f"{name:<24}{scan:>12.3f}{indexed:>14.3f}{scan / indexed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,50 @@
+"""
+Catalog load microbenchmark
+Import time, first-use time and retained memory of the catalog module, each
+measured in a fresh interpreter (bytecode caches warm).
+
+    python benchmarks/bench_catalog_load.py [runs]
+"""
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import gc, json, sys, time, tracemalloc
+trace = sys.argv[1] == "1"
+if trace:
+    tracemalloc.start()
+t0 = time.perf_counter()
+import catalog
+t1 = time.perf_counter()
+catalog.get_all_fonts(); catalog.get_all_colors(); catalog.get_version_by_id("kjv")
+t2 = time.perf_counter()
+gc.collect()
+retained = tracemalloc.get_traced_memory()[0] if trace else 0
+print(json.dumps({"import_ms": (t1 - t0) * 1e3, "first_use_ms": (t2 - t1) * 1e3, "retained_kib": retained / 1024}))
+"""
+
+
+def probe(trace: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, "1" if trace else "0"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out)
+
+
+def main(runs: int = 20) -> None:
+    probe(False)  # write bytecode caches
+    timings = [probe(False) for _ in range(runs)]
+    memory = probe(True)
+    print(f"import     {statistics.median(t['import_ms'] for t in timings):8.2f} ms (median of {runs})")
+    print(f"first use  {statistics.median(t['first_use_ms'] for t in timings):8.2f} ms")
+    print(f"retained   {memory['retained_kib']:8.0f} KiB (catalog and its data, after first use)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
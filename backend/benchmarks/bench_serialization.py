@@ -0,0 +1,71 @@
+"""
+Highlight serialization microbenchmark
+Time to turn 1k highlight documents into a response body through FastAPI's
+default path (jsonable_encoder + JSONResponse) versus FastJSONResponse.
+
+    python benchmarks/bench_serialization.py [count] [repeat]
+"""
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from fast_json import FastJSONResponse, orjson
+
+
+def make_highlights(count: int, with_object_id: bool = False):
+    start = datetime(2024, 1, 1)
+    docs = []
+    for i in range(count):
+        doc = {
+            "id": str(uuid.uuid4()),
+            "user_id": "user-1",
+            "book": "Psalms",
+            "chapter": 1 + i // 20,
+            "verse": 1 + i % 20,
+            "color_id": "yellow",
+            "color_hex": "#FDE68A",
+            "text": "The LORD is my shepherd; I shall not want.",
+            "created_at": start + timedelta(seconds=i),
+        }
+        if with_object_id:
+            doc["_id"] = ObjectId()
+        docs.append(doc)
+    return docs
+
+
+def default_path(body):
+    return JSONResponse(jsonable_encoder(body)).body
+
+
+def fast_path(body):
+    return FastJSONResponse(body).body
+
+
+def main(count: int = 1000, repeat: int = 200) -> None:
+    body = {"highlights": make_highlights(count), "next_cursor": None}
+    print(f"{count} highlights, best of 5 x {repeat} runs (orjson {'on' if orjson else 'off'})")
+    for name, fn in (("jsonable_encoder + JSONResponse", default_path), ("FastJSONResponse", fast_path)):
+        best = min(timeit.repeat(lambda: fn(body), number=repeat, repeat=5)) / repeat
+        print(f"  {name:<34} {best * 1000:8.3f} ms")
+
+    raw = {"highlights": make_highlights(count, with_object_id=True)}
+    try:
+        default_path(raw)
+        print("  unprojected _id: default path ok")
+    except Exception as e:
+        print(f"  unprojected _id: default path fails ({type(e).__name__})")
+    fast_path(raw)
+    print("  unprojected _id: FastJSONResponse ok")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
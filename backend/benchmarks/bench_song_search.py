@@ -0,0 +1,67 @@
+"""
+Worship song search microbenchmark
+Search, autocomplete and artist lookups against a synthetic catalog (the
+real songs plus generated ones), comparing the old substring scans with the
+song index.
+
+    python benchmarks/bench_song_search.py [songs]
+"""
+import random
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from song_index import SongIndex
+from worship_music_data import WORSHIP_ARTISTS, WORSHIP_SONGS
+
+
+def synthetic_catalog(size: int, seed: int = 7):
+    """The real catalog plus songs and artists named from a large pseudo-word vocabulary"""
+    rng = random.Random(seed)
+    syllables = ["ba", "ce", "di", "fo", "gu", "ha", "je", "ki", "lo", "mu", "na", "pe", "ri", "so", "tu",
+                 "va", "we", "xi", "yo", "za", "bri", "cla", "dre", "glo", "pra", "sha", "thr", "ven"]
+    real_words = sorted({w for s in WORSHIP_SONGS for w in s["title"].split()})
+    vocab = real_words + ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(size // 2)]
+    artists = list(WORSHIP_ARTISTS) + [
+        {"id": f"artist-{i}", "name": f"{rng.choice(vocab).title()} {rng.choice(['Worship', 'Music', 'Collective', 'Band'])}"}
+        for i in range(size // 20)
+    ]
+    songs = [dict(s) for s in WORSHIP_SONGS]
+    for i in range(size - len(songs)):
+        artist = rng.choice(artists)
+        title = " ".join(rng.choice(vocab).title() for _ in range(rng.randint(1, 4)))
+        songs.append({"id": f"syn{i}", "title": title, "artist_id": artist["id"], "artist_name": artist["name"]})
+    return songs, artists
+
+
+def per_call_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def main(size: int = 30000) -> None:
+    songs, artists = synthetic_catalog(size)
+    started = time.perf_counter()
+    index = SongIndex(songs, artists)
+    print(f"{len(songs)} songs, built in {(time.perf_counter() - started) * 1e3:.0f} ms: {index.stats()}")
+
+    def scan(query):
+        q = query.lower()
+        return [s for s in songs if q in s["title"].lower() or q in s["artist_name"].lower()]
+
+    print(f"{'operation':<34}{'scan (us)':>12}{'index (us)':>12}")
+    for query in ("oceans", "way maker", "hillsong", "hilsong", "oceons", "grace", "graec", "amazng grace"):
+        print(f"{'search ' + repr(query):<34}{per_call_us(lambda: scan(query), 20):>12.0f}"
+              f"{per_call_us(lambda: index.search(query, 20), 200):>12.0f}")
+    for prefix in ("h", "hill", "gra", "tomli"):
+        print(f"{'autocomplete ' + repr(prefix):<34}{'':>12}{per_call_us(lambda: index.autocomplete(prefix), 500):>12.0f}")
+    artist_id = artists[-1]["id"]
+    print(f"{'artist songs':<34}"
+          f"{per_call_us(lambda: [s for s in songs if s['artist_id'] == artist_id], 50):>12.0f}"
+          f"{per_call_us(lambda: index.artist_songs(artist_id), 10000):>12.2f}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
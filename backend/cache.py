@@ -0,0 +1,112 @@
+"""
+In-process cache primitives for Ayumi
+Small, dependency-free caches shared by the service layer
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(1, max_entries)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (refreshing its recency) or None"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove and return a value if present"""
+        return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries expire ttl_seconds after they are stored.
+
+    Fills that race a write can be dropped with a token: take `token()`
+    before reading the source of truth and pass it to `set`; if any key was
+    written or invalidated in between, the fill is skipped.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60.0):
+        super().__init__(max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.expirations = 0
+        self._writes = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self.hits -= 1
+            self.misses += 1
+            self.expirations += 1
+            return None
+        return value
+
+    def token(self) -> int:
+        return self._writes
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        if token is None:
+            self._writes += 1
+        elif token != self._writes:
+            return
+        super().set(key, (time.monotonic() + self.ttl_seconds, value))
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        self._writes += 1
+        entry = super().pop(key)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        self._writes += 1
+        super().clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = super().stats()
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["expirations"] = self.expirations
+        return stats
@@ -0,0 +1,221 @@
+"""
+Static catalogs for Ayumi
+Bible versions, fonts and highlight colors live in a versioned data file
+(data/catalogs.v1.json) that is read on first use, not at import. Each row
+becomes a small read-only __slots__ record, and the id and
+category/language indexes are built once at that point, so lookups are
+dictionary hits instead of list scans.
+
+In the data file every catalog is a list of field names plus one array per
+record; null marks a field the record does not have.
+"""
+import json
+import os
+import sys
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+CATALOG_FORMAT_VERSION = 1
+CATALOG_DATA_PATH = Path(os.getenv('CATALOG_DATA_PATH', Path(__file__).parent / 'data' / 'catalogs.v1.json'))
+
+# Secondary index keys per catalog
+CATALOG_KEYS = {
+    "versions": ("language_code",),
+    "fonts": ("category",),
+    "colors": ("category",),
+}
+
+
+class Record(Mapping):
+    """Read-only catalog record; each catalog gets a subclass with one slot per field"""
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Record":
+        record = object.__new__(cls)
+        for field, value in zip(cls._fields, row):
+            if value is not None:
+                object.__setattr__(record, field, value)
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:  # field absent from this record
+                pass
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self._fields if hasattr(self, field))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def record_type(name: str, fields: Sequence[str]) -> type:
+    """Build a Record subclass with a slot per field"""
+    fields = tuple(fields)
+    clashes = [field for field in fields if hasattr(Record, field)]
+    if clashes:
+        raise ValueError(f"Catalog {name} has fields that shadow Mapping methods: {clashes}")
+    return type(f"{name.title()}Record", (Record,), {
+        "__slots__": fields,
+        "_fields": fields,
+        "_field_set": frozenset(fields),
+    })
+
+
+class Catalog:
+    """Frozen records indexed by id and by a few secondary keys"""
+
+    def __init__(self, records: Iterable[Record], keys: Sequence[str] = (), fields: Sequence[str] = ()):
+        self.records: Tuple[Record, ...] = tuple(records)
+        self.fields = tuple(fields)
+        by_id: Dict[str, Record] = {}
+        for record in self.records:
+            # First definition wins, as it did for the linear scans
+            by_id.setdefault(record["id"], record)
+        self._by_id = MappingProxyType(by_id)
+        self._by_key: Dict[str, Mapping] = {}
+        for key in keys:
+            groups: Dict[Any, list] = {}
+            for record in self.records:
+                groups.setdefault(record.get(key), []).append(record)
+            self._by_key[key] = MappingProxyType({value: tuple(group) for value, group in groups.items()})
+
+    def all(self) -> Tuple[Record, ...]:
+        return self.records
+
+    def get(self, record_id: str) -> Optional[Record]:
+        return self._by_id.get(record_id)
+
+    def where(self, key: str, value: Any) -> Tuple[Record, ...]:
+        """Records whose key equals value, in catalog order"""
+        return self._by_key[key].get(value, ())
+
+    def groups(self, key: str) -> Mapping:
+        return self._by_key[key]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def _intern(value: Any) -> Any:
+    # Codes, categories and weights repeat across hundreds of records
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def load_catalogs(path: Path = CATALOG_DATA_PATH) -> Dict[str, Catalog]:
+    """Read the data file into catalogs"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format_version") != CATALOG_FORMAT_VERSION:
+        raise RuntimeError(
+            f"Catalog data {path} has format_version {data.get('format_version')}, "
+            f"expected {CATALOG_FORMAT_VERSION}"
+        )
+    catalogs = {}
+    for name, keys in CATALOG_KEYS.items():
+        spec = data["catalogs"][name]
+        cls = record_type(name, spec["fields"])
+        catalogs[name] = Catalog(
+            (cls.from_row([_intern(v) for v in row]) for row in spec["rows"]), keys=keys, fields=cls._fields
+        )
+    return catalogs
+
+
+_catalogs: Optional[Dict[str, Any]] = None
+_load_lock = threading.Lock()
+
+
+def _loaded() -> Dict[str, Any]:
+    global _catalogs
+    if _catalogs is None:
+        with _load_lock:
+            if _catalogs is None:
+                catalogs = load_catalogs()
+                # language_code -> language name, in first-seen order
+                catalogs["languages"] = MappingProxyType({
+                    code: records[0]["language"]
+                    for code, records in catalogs["versions"].groups("language_code").items()
+                })
+                _catalogs = catalogs
+    return _catalogs
+
+
+_MODULE_ATTRS = {"VERSIONS": "versions", "FONTS": "fonts", "COLORS": "colors", "LANGUAGES": "languages"}
+
+
+def __getattr__(name: str) -> Any:
+    # VERSIONS, FONTS, COLORS and LANGUAGES load the data file on first access
+    if name in _MODULE_ATTRS:
+        return _loaded()[_MODULE_ATTRS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_catalog_fields(name: str) -> Tuple[str, ...]:
+    """Field names of a catalog ("versions", "fonts" or "colors"), in record order"""
+    return _loaded()[name].fields
+
+
+def get_all_versions() -> Tuple[Record, ...]:
+    """Get all Bible versions"""
+    return _loaded()["versions"].all()
+
+
+def get_versions_by_language(language_code: str) -> Tuple[Record, ...]:
+    """Get Bible versions for a specific language"""
+    return _loaded()["versions"].where("language_code", language_code)
+
+
+def get_version_by_id(version_id: str) -> Optional[Record]:
+    """Get a specific Bible version by ID"""
+    return _loaded()["versions"].get(version_id)
+
+
+def get_available_languages() -> Mapping:
+    """Get list of available languages"""
+    return _loaded()["languages"]
+
+
+def get_all_fonts() -> Tuple[Record, ...]:
+    """Get all available fonts"""
+    return _loaded()["fonts"].all()
+
+
+def get_fonts_by_category(category: str) -> Tuple[Record, ...]:
+    """Get fonts by category"""
+    return _loaded()["fonts"].where("category", category)
+
+
+def get_font_by_id(font_id: str) -> Optional[Record]:
+    """Get specific font by ID"""
+    return _loaded()["fonts"].get(font_id)
+
+
+def get_all_colors() -> Tuple[Record, ...]:
+    """Get all highlight colors"""
+    return _loaded()["colors"].all()
+
+
+def get_colors_by_category(category: str) -> Tuple[Record, ...]:
+    """Get colors by category"""
+    return _loaded()["colors"].where("category", category)
+
+
+def get_color_by_id(color_id: str) -> Optional[Record]:
+    """Get specific color by ID"""
+    return _loaded()["colors"].get(color_id)
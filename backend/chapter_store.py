@@ -0,0 +1,124 @@
+"""
+Canonical Bible chapter store for Ayumi
+Scripture text for a (version, book, chapter) never changes, so once the LLM
+has produced a chapter we keep it in MongoDB and in a bounded in-process LRU.
+"""
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+CHAPTER_CACHE_SIZE = int(os.getenv('CHAPTER_CACHE_SIZE', '512'))
+
+
+def normalize_book(book: str) -> str:
+    """Normalize a book name for use in cache keys ("1  john" -> "1 john")"""
+    return " ".join(book.split()).lower()
+
+
+def make_chapter_key(book: str, chapter: int, version: str) -> str:
+    """Build the canonical key for a chapter"""
+    return f"{version.strip().upper()}:{normalize_book(book)}:{int(chapter)}"
+
+
+class ChapterStore:
+    """Two-tier chapter cache: in-process LRU in front of a Mongo collection"""
+
+    def __init__(self, max_entries: int = CHAPTER_CACHE_SIZE):
+        self._memory = LRUCache(max_entries)
+        self._collection = None
+        self._listeners: List[Callable[[str, int, str, List[Dict[str, Any]]], None]] = []
+        self.mongo_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def attach(self, collection) -> None:
+        """Attach the Mongo collection backing the durable tier"""
+        self._collection = collection
+
+    def add_listener(self, listener: Callable[[str, int, str, List[Dict[str, Any]]], None]) -> None:
+        """Call listener(book, chapter, version, verses) whenever a chapter is stored"""
+        self._listeners.append(listener)
+
+    async def get(self, book: str, chapter: int, version: str) -> Optional[List[Dict[str, Any]]]:
+        """Return stored verses for a chapter, or None on a miss"""
+        key = make_chapter_key(book, chapter, version)
+        verses = self._memory.get(key)
+        if verses is not None:
+            return verses
+
+        if self._collection is not None:
+            try:
+                doc = await self._collection.find_one({"key": key}, {"_id": 0, "verses": 1})
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Chapter store read error for {key}: {e}")
+                doc = None
+            if doc and doc.get("verses"):
+                self.mongo_hits += 1
+                self._memory.set(key, doc["verses"])
+                return doc["verses"]
+
+        self.misses += 1
+        return None
+
+    async def put(self, book: str, chapter: int, version: str, verses: List[Dict[str, Any]]) -> None:
+        """Store a complete chapter in both tiers; empty results are never stored"""
+        if not isinstance(verses, list) or not verses:
+            return
+        key = make_chapter_key(book, chapter, version)
+        self._memory.set(key, verses)
+        for listener in self._listeners:
+            try:
+                listener(book, chapter, version, verses)
+            except Exception as e:
+                logger.error(f"Chapter store listener error for {key}: {e}")
+
+        if self._collection is None:
+            return
+        try:
+            await self._collection.update_one(
+                {"key": key},
+                {"$set": {
+                    "key": key,
+                    "version": version.strip().upper(),
+                    "book": book,
+                    "chapter": int(chapter),
+                    "verses": verses,
+                    "stored_at": datetime.utcnow(),
+                }},
+                upsert=True
+            )
+            self.writes += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Chapter store write error for {key}: {e}")
+
+    def evict(self, book: str, chapter: int, version: str) -> None:
+        """Drop a chapter from the in-process tier"""
+        self._memory.pop(make_chapter_key(book, chapter, version))
+
+    def clear(self) -> None:
+        """Drop every chapter from the in-process tier"""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self._memory.stats()
+        lookups = memory["hits"] + self.mongo_hits + self.misses
+        return {
+            "memory": memory,
+            "memory_hits": memory["hits"],
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "hit_ratio": round((memory["hits"] + self.mongo_hits) / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "errors": self.errors,
+        }
+
+
+chapter_store = ChapterStore()
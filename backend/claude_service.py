@@ -2,29 +2,77 @@
 Claude AI Service for Ayumi - Walking with God
 Using Emergent LLM Key (Option B)
 """
-from emergentintegrations.llm.chat import LlmChat, UserMessage
-import json
-from typing import Dict, List, Any, Optional
+from emergentintegrations.llm.chat import LlmChat
+from typing import AsyncIterator, Dict, List, Any, Optional, Sequence
 import os
 from dotenv import load_dotenv
 
+from cache import TTLCache
+from chapter_store import chapter_store, make_chapter_key, normalize_book
+from content_pool import ContentPool
+from json_extract import IncrementalJSONParser, extract_json, extract_json_payload
+from llm_pool import LLMClientPool, LLMOverloaded
+from singleflight import SingleFlight
+
 load_dotenv()
 
 EMERGENT_LLM_KEY = os.getenv('EMERGENT_LLM_KEY', 'sk-emergent-b2cA3430e448e7321C')
+# Direct Anthropic key, used for token streaming (the Emergent client only
+# returns complete responses)
+CLAUDE_API_KEY = os.getenv('CLAUDE_API_KEY')
+CLAUDE_STREAM_MODEL = os.getenv('CLAUDE_STREAM_MODEL', 'claude-sonnet-4-20250514')
+
+SYSTEM_MESSAGE = "You are a theologically sound Bible assistant. Provide accurate, evangelical, gospel-centered content."
 
 print(f"✓ Using Emergent LLM key for Claude Sonnet")
 
+# Concurrent identical LLM requests share one upstream call
+llm_flights = SingleFlight()
+
+# Finished chapter contexts, so a request that gave up waiting (context
+# "pending") or a later visit does not pay for another LLM call
+context_cache = TTLCache(
+    max_entries=int(os.getenv('CONTEXT_CACHE_SIZE', '512')),
+    ttl_seconds=float(os.getenv('CONTEXT_CACHE_TTL', '3600'))
+)
+
 def get_chat_client(session_id: str = "ayumi-default") -> LlmChat:
     """Get configured LlmChat client using Emergent"""
     chat = LlmChat(
         api_key=EMERGENT_LLM_KEY,
         session_id=session_id,
-        system_message="You are a theologically sound Bible assistant. Provide accurate, evangelical, gospel-centered content."
+        system_message=SYSTEM_MESSAGE
     )
     chat.with_model("anthropic", "claude-4-sonnet-20250514")
     return chat
 
 
+# Every LLM call goes through the pool so upstream concurrency stays bounded
+llm_pool = LLMClientPool(get_chat_client)
+
+
+async def stream_chat_text(prompt: str, session_id: str = "ayumi-default", max_tokens: int = 8192) -> AsyncIterator[str]:
+    """Yield response text chunks as the model produces them.
+
+    Streams from the Anthropic API when CLAUDE_API_KEY is configured;
+    otherwise yields the complete Emergent response as a single chunk.
+    """
+    client = llm_pool.anthropic_client(CLAUDE_API_KEY) if CLAUDE_API_KEY else None
+    if client is None:
+        yield await llm_pool.send(session_id, prompt)
+        return
+
+    async with llm_pool.slot():
+        async with client.messages.stream(
+            model=CLAUDE_STREAM_MODEL,
+            max_tokens=max_tokens,
+            system=SYSTEM_MESSAGE,
+            messages=[{"role": "user", "content": prompt}],
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+
 FALLBACK_HOME_DASHBOARD = {
     "date": "",
     "verse": {
@@ -87,13 +135,15 @@ FALLBACK_HOME_DASHBOARD = {
     }
 }
 
+# Top-level keys each prompt asks for; a response without them (e.g. cut
+# off mid-object) is a failure, not content
+DASHBOARD_KEYS = ("verse", "passage", "devotional", "questions", "prayer", "theme", "attribute", "gospel", "history")
+CONTEXT_KEYS = ("reference", "outline", "author", "historicalSetting", "purpose", "crossReferences")
 
-async def generate_home_dashboard() -> Dict[str, Any]:
-    """Generate comprehensive daily dashboard content"""
-    try:
-        chat = get_chat_client(session_id="dashboard")
-        
-        prompt = """Generate a comprehensive daily devotional dashboard for 'Ayumi - Walking with God'.
+
+async def _fetch_home_dashboard() -> Dict[str, Any]:
+    """Ask the LLM for the daily dashboard; raises on failure"""
+    prompt = """Generate a comprehensive daily devotional dashboard for 'Ayumi - Walking with God'.
 
 Requirements:
 - Use English Standard Version (ESV) for scripture
@@ -114,59 +164,71 @@ Return a JSON object with this structure (return ONLY the JSON):
   "history": {"event": "event", "reference": "ref", "description": "desc", "timeline": {"before": "b", "during": "d", "after": "a"}}
 }"""
 
-        message = UserMessage(text=prompt)
-        response = await chat.send_message(message)
-        
-        # Try to extract JSON from the response
-        text = response.strip()
-        # Remove markdown code fences if present
-        if text.startswith('```'):
-            text = text.split('\n', 1)[1] if '\n' in text else text[3:]
-            if text.endswith('```'):
-                text = text[:-3]
-            text = text.strip()
-        if text.startswith('json'):
-            text = text[4:].strip()
-        
-        dashboard_data = json.loads(text)
-        
-        from datetime import datetime
-        dashboard_data['date'] = datetime.utcnow().isoformat()
-        return dashboard_data
-        
+    response = await llm_pool.send("dashboard", prompt)
+    dashboard_data = require_keys(parse_json_response(response), DASHBOARD_KEYS, "Dashboard")
+
+    from datetime import datetime
+    dashboard_data['date'] = datetime.utcnow().isoformat()
+    return dashboard_data
+
+
+async def generate_home_dashboard(raise_on_error: bool = False) -> Dict[str, Any]:
+    """Generate comprehensive daily dashboard content.
+
+    With raise_on_error the failure is raised instead of returning the
+    fallback, so callers that persist the result never store the fallback.
+    """
+    try:
+        return await llm_flights.do(("dashboard",), _fetch_home_dashboard)
     except Exception as e:
         print(f"Dashboard error: {e}")
+        if raise_on_error:
+            raise
         from datetime import datetime
         FALLBACK_HOME_DASHBOARD['date'] = datetime.utcnow().isoformat()
         return FALLBACK_HOME_DASHBOARD
 
 
 def parse_json_response(text: str):
-    """Helper to parse JSON from LLM responses, handling markdown fences"""
-    text = text.strip()
-    if text.startswith('```'):
-        text = text.split('\n', 1)[1] if '\n' in text else text[3:]
-        if text.endswith('```'):
-            text = text[:-3]
-        text = text.strip()
-    if text.startswith('json'):
-        text = text[4:].strip()
-    return json.loads(text)
+    """Helper to parse JSON from LLM responses (fences, prose and truncated arrays are tolerated)"""
+    return extract_json(text)
 
 
-async def generate_devotional(topic: Optional[str] = None) -> Dict[str, Any]:
-    """Generate devotional content"""
-    try:
-        chat = get_chat_client(session_id="devotional")
-        topic_text = f" on {topic}" if topic else ""
-        prompt = f"""Generate deep devotional content{topic_text}.
+def require_keys(data: Any, keys: Sequence[str], what: str) -> Dict[str, Any]:
+    """Check an LLM response is an object with every key its prompt asked for"""
+    if not isinstance(data, dict):
+        raise ValueError(f"{what} response is not a JSON object")
+    missing = [key for key in keys if key not in data]
+    if missing:
+        raise ValueError(f"{what} response is missing {missing}")
+    return data
+
+
+def _pool_key(text: Optional[str]) -> str:
+    """Pool bucket for free-text input ("" for none)"""
+    return " ".join((text or "").lower().split())
+
+
+def _pool_text(text: Optional[str]) -> str:
+    """Free-text input as prompts get it: the user's casing, tidied whitespace"""
+    return " ".join((text or "").split())
+
+
+async def _fetch_devotional(topic: str) -> Dict[str, Any]:
+    topic_text = f" on {topic}" if topic else ""
+    prompt = f"""Generate deep devotional content{topic_text}.
 
 Return JSON (ONLY JSON, no markdown):
 {{"title": "title", "scripture": {{"text": "text", "reference": "ref"}}, "reflection": "reflection", "prayer": "prayer", "stepOfFaith": "step", "tags": ["tag1"]}}"""
 
-        message = UserMessage(text=prompt)
-        response = await chat.send_message(message)
-        return parse_json_response(response)
+    response = await llm_pool.send("devotional", prompt)
+    return parse_json_response(response)
+
+
+async def generate_devotional(topic: Optional[str] = None) -> Dict[str, Any]:
+    """Generate devotional content"""
+    try:
+        return await devotional_pool.take(_pool_key(topic), _pool_text(topic))
         
     except Exception as e:
         print(f"Devotional error: {e}")
@@ -180,21 +242,62 @@ Return JSON (ONLY JSON, no markdown):
         }
 
 
-async def get_bible_chapter(book: str, chapter: int, version: str = "ESV") -> List[Dict[str, Any]]:
-    """Get full Bible chapter"""
-    try:
-        chat = get_chat_client(session_id=f"bible-{book}-{chapter}")
-        prompt = f"""Provide {book} chapter {chapter} in {version}.
+def _bible_chapter_prompt(book: str, chapter: int, version: str) -> str:
+    return f"""Provide {book} chapter {chapter} in {version}.
 
 Return JSON array (ONLY the array, no markdown):
 [{{"book":"{book}","chapter":{chapter},"verse":1,"text":"verse text"}},{{"book":"{book}","chapter":{chapter},"verse":2,"text":"verse text"}}]
 
 Include ALL verses with exact biblical text."""
 
-        message = UserMessage(text=prompt)
-        response = await chat.send_message(message)
-        return parse_json_response(response)
-        
+
+async def _fetch_bible_chapter(book: str, chapter: int, version: str) -> List[Dict[str, Any]]:
+    """Ask the LLM for a chapter and store it; raises on failure"""
+    response = await llm_pool.send(f"bible-{book}-{chapter}", _bible_chapter_prompt(book, chapter, version))
+    verses, complete = extract_json_payload(response)
+    if complete:
+        # Salvaged (truncated) chapters are served but never stored
+        await chapter_store.put(book, chapter, version, verses)
+    return verses
+
+
+async def stream_bible_chapter(book: str, chapter: int, version: str = "ESV") -> AsyncIterator[Dict[str, Any]]:
+    """Yield a chapter's verses as soon as each one is complete.
+
+    Stored chapters are replayed from the chapter store; otherwise verses are
+    parsed out of the LLM stream and the assembled chapter is stored at the end.
+    """
+    cached = await chapter_store.get(book, chapter, version)
+    if cached is not None:
+        for verse in cached:
+            yield verse
+        return
+
+    parser = IncrementalJSONParser()
+    verses = []
+    async for chunk in stream_chat_text(_bible_chapter_prompt(book, chapter, version), session_id=f"bible-{book}-{chapter}"):
+        for verse in parser.feed(chunk):
+            if isinstance(verse, dict):
+                verses.append(verse)
+                yield verse
+    if parser.complete:
+        await chapter_store.put(book, chapter, version, verses)
+
+
+async def get_bible_chapter(book: str, chapter: int, version: str = "ESV") -> List[Dict[str, Any]]:
+    """Get full Bible chapter, served from the chapter store when already fetched"""
+    cached = await chapter_store.get(book, chapter, version)
+    if cached is not None:
+        return cached
+
+    try:
+        return await llm_flights.do(
+            ("bible", make_chapter_key(book, chapter, version)),
+            lambda: _fetch_bible_chapter(book, chapter, version)
+        )
+    except LLMOverloaded:
+        # Shed load instead of answering with an empty chapter
+        raise
     except Exception as e:
         print(f"Bible chapter error: {e}")
         import traceback
@@ -202,48 +305,71 @@ Include ALL verses with exact biblical text."""
         return []
 
 
-async def get_chapter_context(book: str, chapter: int) -> Optional[Dict[str, Any]]:
-    """Get chapter context"""
-    try:
-        chat = get_chat_client(session_id=f"context-{book}-{chapter}")
-        prompt = f"""Context for {book} chapter {chapter}.
+async def _fetch_chapter_context(book: str, chapter: int) -> Optional[Dict[str, Any]]:
+    """Ask the LLM for chapter context; raises on failure"""
+    prompt = f"""Context for {book} chapter {chapter}.
 
 Return JSON (ONLY JSON, no markdown):
 {{"reference":"{book} {chapter}","outline":["point1"],"author":"author","historicalSetting":"setting","purpose":"purpose","crossReferences":["ref1"]}}"""
 
-        message = UserMessage(text=prompt)
-        response = await chat.send_message(message)
-        return parse_json_response(response)
+    response = await llm_pool.send(f"context-{book}-{chapter}", prompt)
+    return require_keys(parse_json_response(response), CONTEXT_KEYS, "Chapter context")
+
+
+async def _load_chapter_context(key: tuple, book: str, chapter: int) -> Optional[Dict[str, Any]]:
+    """Fetch chapter context and keep it, even if every waiter has gone"""
+    context = await _fetch_chapter_context(book, chapter)
+    if context is not None:
+        context_cache.set(key, context)
+    return context
+
+
+async def get_chapter_context(book: str, chapter: int) -> Optional[Dict[str, Any]]:
+    """Get chapter context"""
+    key = ("context", normalize_book(book), int(chapter))
+    cached = context_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        return await llm_flights.do(key, lambda: _load_chapter_context(key, book, chapter))
         
     except Exception as e:
         print(f"Context error: {e}")
         return None
 
 
+async def _fetch_prayer_prompts(verse: str) -> List[str]:
+    prompt = f"""Based on "{verse}", generate 3 prayer prompts.
+Return JSON array (ONLY array, no markdown): ["prompt1","prompt2","prompt3"]"""
+
+    response = await llm_pool.send("prayer-prompts", prompt)
+    return parse_json_response(response)
+
+
 async def generate_prayer_prompts(verse: str) -> List[str]:
     """Generate prayer prompts"""
     try:
-        chat = get_chat_client(session_id="prayer-prompts")
-        prompt = f"""Based on "{verse}", generate 3 prayer prompts.
-Return JSON array (ONLY array, no markdown): ["prompt1","prompt2","prompt3"]"""
-
-        message = UserMessage(text=prompt)
-        response = await chat.send_message(message)
-        return parse_json_response(response)
+        return await prayer_prompt_pool.take(_pool_key(verse), _pool_text(verse))
         
     except Exception as e:
         return ["Lord, help me apply this truth.", "Thank You for Your Word.", "Give me faith to live this out."]
 
 
+async def _fetch_prayer(prayer_type: str) -> str:
+    prompt = f"Write a short {prayer_type} prayer (2-3 sentences)."
+    return await llm_pool.send("prayer-gen", prompt)
+
+
 async def generate_prayer(prayer_type: str) -> str:
     """Generate prayer"""
     try:
-        chat = get_chat_client(session_id="prayer-gen")
-        prompt = f"Write a short {prayer_type} prayer (2-3 sentences)."
-
-        message = UserMessage(text=prompt)
-        response = await chat.send_message(message)
-        return response
+        return await prayer_pool.take(_pool_key(prayer_type), _pool_text(prayer_type))
         
     except Exception as e:
         return "Lord, teach us to pray. Help us seek Your face. Amen."
+
+
+# Pre-generated devotionals and prayers, bucketed by topic / verse / prayer type
+devotional_pool = ContentPool("devotional", _fetch_devotional)
+prayer_prompt_pool = ContentPool("prayer-prompts", _fetch_prayer_prompts)
+prayer_pool = ContentPool("prayer", _fetch_prayer)
@@ -0,0 +1,156 @@
+"""
+Pre-generated content pools for Ayumi
+Keeps a queue of ready LLM-generated items per bucket (devotional topic,
+prayer type, verse) so requests pop an item instantly. A background task
+refills a bucket up to its high watermark whenever it drops below the low one.
+
+Only warmed buckets and buckets requested repeatedly are refilled; a bucket
+keyed by a one-off verse or topic generates inline, exactly once.
+
+Buckets are normalized keys; the producer is given the caller's own text for
+an inline miss, and the first text seen for the bucket for background refills.
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+CONTENT_POOL_LOW_WATERMARK = int(os.getenv('CONTENT_POOL_LOW_WATERMARK', '2'))
+CONTENT_POOL_HIGH_WATERMARK = int(os.getenv('CONTENT_POOL_HIGH_WATERMARK', '5'))
+CONTENT_POOL_MAX_BUCKETS = int(os.getenv('CONTENT_POOL_MAX_BUCKETS', '64'))
+# Requests a bucket needs before it is refilled in the background
+CONTENT_POOL_HOT_AFTER = int(os.getenv('CONTENT_POOL_HOT_AFTER', '3'))
+# After a failed refill, wait this long before refilling again so an LLM
+# outage does not double the failing calls
+CONTENT_POOL_RETRY_SECONDS = float(os.getenv('CONTENT_POOL_RETRY_SECONDS', '30'))
+
+
+class ContentPool:
+    """Per-bucket queues of pre-generated items with background refill.
+
+    Items are handed out once, so each request still gets fresh content.
+    Buckets are created on first use and the least recently used idle one
+    is dropped once more than max_buckets exist.
+    """
+
+    def __init__(self, name: str, produce: Callable[[Any], Awaitable[Any]],
+                 low_watermark: int = CONTENT_POOL_LOW_WATERMARK,
+                 high_watermark: int = CONTENT_POOL_HIGH_WATERMARK,
+                 max_buckets: int = CONTENT_POOL_MAX_BUCKETS,
+                 hot_after: int = CONTENT_POOL_HOT_AFTER):
+        self.name = name
+        self._produce = produce
+        self.low_watermark = low_watermark
+        self.high_watermark = max(high_watermark, low_watermark)
+        self.max_buckets = max_buckets
+        self.hot_after = max(1, hot_after)
+        self._buckets: "OrderedDict[Hashable, Deque[Any]]" = OrderedDict()
+        self._refills: Dict[Hashable, asyncio.Task] = {}
+        self._pinned: Set[Hashable] = set()
+        self._requests: Dict[Hashable, int] = {}
+        self._texts: Dict[Hashable, Any] = {}
+        self._retry_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.produced = 0
+        self.failures = 0
+
+    async def take(self, bucket: Hashable, text: Any = None) -> Any:
+        """Pop a ready item for the bucket, generating one inline on a miss.
+
+        text is the input as the caller gave it (the bucket when omitted).
+        """
+        items = self._bucket(bucket)
+        self._requests[bucket] = self._requests.get(bucket, 0) + 1
+        if text is None:
+            text = bucket
+        self._texts.setdefault(bucket, text)
+        if items:
+            self.hits += 1
+            item = items.popleft()
+        else:
+            self.misses += 1
+            item = None
+        self._schedule_refill(bucket)
+        if item is None:
+            item = await self._produce(text)
+        return item
+
+    def warm(self, buckets: Iterable[Hashable]) -> None:
+        """Start filling the given buckets and keep them from being evicted"""
+        for bucket in buckets:
+            self._pinned.add(bucket)
+            self._bucket(bucket)
+            self._schedule_refill(bucket)
+
+    def _bucket(self, bucket: Hashable) -> Deque[Any]:
+        items = self._buckets.get(bucket)
+        if items is None:
+            items = self._buckets[bucket] = deque()
+            self._evict()
+        else:
+            self._buckets.move_to_end(bucket)
+        return items
+
+    def _evict(self) -> None:
+        for bucket in list(self._buckets):
+            if len(self._buckets) <= self.max_buckets:
+                break
+            if bucket in self._pinned or bucket in self._refills:
+                continue
+            del self._buckets[bucket]
+            self._requests.pop(bucket, None)
+            self._texts.pop(bucket, None)
+
+    def _is_hot(self, bucket: Hashable) -> bool:
+        return bucket in self._pinned or self._requests.get(bucket, 0) >= self.hot_after
+
+    def _schedule_refill(self, bucket: Hashable) -> None:
+        if bucket in self._refills or len(self._buckets.get(bucket, ())) >= self.low_watermark:
+            return
+        if not self._is_hot(bucket):
+            # Pre-generating for a bucket that may never be asked for again wastes LLM calls
+            return
+        if asyncio.get_running_loop().time() < self._retry_at:
+            return
+        task = asyncio.ensure_future(self._refill(bucket))
+        self._refills[bucket] = task
+        task.add_done_callback(lambda t, b=bucket: self._refills.pop(b, None))
+
+    async def _refill(self, bucket: Hashable) -> None:
+        while True:
+            items = self._buckets.get(bucket)
+            if items is None or len(items) >= self.high_watermark:
+                return
+            try:
+                item = await self._produce(self._texts.get(bucket, bucket))
+            except Exception as e:
+                # Leave the bucket short; the next take() schedules another refill
+                self.failures += 1
+                self._retry_at = asyncio.get_running_loop().time() + CONTENT_POOL_RETRY_SECONDS
+                logger.error(f"{self.name} pool refill error for {bucket!r}: {e}")
+                return
+            self.produced += 1
+            items.append(item)
+
+    async def stop(self) -> None:
+        """Cancel in-flight refills"""
+        tasks = list(self._refills.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buckets": len(self._buckets),
+            "ready": sum(len(items) for items in self._buckets.values()),
+            "refilling": len(self._refills),
+            "hot": sum(1 for bucket in self._buckets if self._is_hot(bucket)),
+            "hits": self.hits,
+            "misses": self.misses,
+            "produced": self.produced,
+            "failures": self.failures,
+        }
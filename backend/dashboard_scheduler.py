@@ -0,0 +1,241 @@
+"""
+Daily dashboard pre-generation for Ayumi
+Generates the next day's dashboard shortly before midnight. A lease document
+in cached_dashboards makes sure only one worker calls the LLM per day.
+
+When every attempt fails, the date cools down: the failing worker keeps the
+lease, marked failed, for DASHBOARD_FAILURE_COOLDOWN_SECONDS so that no worker
+retries before then and requests get the fallback at once. The scheduler
+retries in the background after each cool-down.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_LEASE_SECONDS = int(os.getenv('DASHBOARD_LEASE_SECONDS', '300'))
+DASHBOARD_PREGENERATE_LEAD_MINUTES = int(os.getenv('DASHBOARD_PREGENERATE_LEAD_MINUTES', '30'))
+DASHBOARD_GENERATION_ATTEMPTS = int(os.getenv('DASHBOARD_GENERATION_ATTEMPTS', '3'))
+DASHBOARD_FAILURE_COOLDOWN_SECONDS = float(os.getenv('DASHBOARD_FAILURE_COOLDOWN_SECONDS', '60'))
+DASHBOARD_POLL_SECONDS = 1.0
+
+
+def dashboard_date(offset_days: int = 0) -> str:
+    """Local calendar date used as the cached_dashboards key"""
+    return (datetime.now() + timedelta(days=offset_days)).strftime("%Y-%m-%d")
+
+
+class DashboardScheduler:
+    """Pre-generates daily dashboards and serves them from memory or Mongo"""
+
+    def __init__(self, generate: Callable[[], Awaitable[Dict[str, Any]]],
+                 lease_seconds: int = DASHBOARD_LEASE_SECONDS,
+                 lead_minutes: int = DASHBOARD_PREGENERATE_LEAD_MINUTES):
+        self._generate = generate
+        self._collection = None
+        self.lease_seconds = lease_seconds
+        self.lead_minutes = lead_minutes
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._memo: Dict[str, Dict[str, Any]] = {}
+        # date -> time.monotonic() until which generation is not retried
+        self._cooldowns: Dict[str, float] = {}
+        self._flights = SingleFlight()
+        self._task: Optional[asyncio.Task] = None
+        self.generated = 0
+        self.failures = 0
+
+    def attach(self, collection) -> None:
+        """Attach the cached_dashboards collection"""
+        self._collection = collection
+
+    async def get(self, date: str) -> Optional[Dict[str, Any]]:
+        """Return the stored dashboard for a date, if one exists"""
+        data = self._memo.get(date)
+        if data is not None:
+            return data
+        doc = await self._collection.find_one({"date": date}, {"_id": 0, "data": 1})
+        if doc and doc.get("data"):
+            self._remember(date, doc["data"])
+            return doc["data"]
+        return None
+
+    def forget(self, date: Optional[str] = None) -> None:
+        """Drop memoized dashboards (all of them when no date is given)"""
+        if date is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(date, None)
+
+    def cooling_down(self, date: str) -> bool:
+        """Whether generation for a date failed recently and should not be retried yet"""
+        until = self._cooldowns.get(date)
+        if until is None:
+            return False
+        if time.monotonic() >= until:
+            del self._cooldowns[date]
+            return False
+        return True
+
+    def _cool_down(self, date: str, seconds: float = DASHBOARD_FAILURE_COOLDOWN_SECONDS) -> None:
+        self._cooldowns[date] = time.monotonic() + seconds
+
+    async def ensure(self, date: str) -> Optional[Dict[str, Any]]:
+        """Return the dashboard for a date, generating it under the lease if missing.
+
+        Returns None when generation failed on every attempt or the date is
+        cooling down after such a failure (here or on another worker).
+        """
+        return await self._flights.do(date, lambda: self._ensure(date))
+
+    async def _ensure(self, date: str) -> Optional[Dict[str, Any]]:
+        while True:
+            data = await self.get(date)
+            if data is not None:
+                return data
+            if self.cooling_down(date):
+                return None
+            if await self._acquire_lease(date):
+                try:
+                    data = await self._generate_and_store(date)
+                except BaseException:
+                    await self._release_lease(date)
+                    raise
+                if data is None:
+                    self._cool_down(date)
+                    await self._hold_failed_lease(date)
+                else:
+                    await self._release_lease(date)
+                return data
+            # Another worker holds the lease; wait for its result, its failure or for the lease to lapse
+            remaining = await self._failed_lease_remaining(date)
+            if remaining > 0:
+                self._cool_down(date, remaining)
+                return None
+            await asyncio.sleep(DASHBOARD_POLL_SECONDS)
+
+    async def _generate_and_store(self, date: str) -> Optional[Dict[str, Any]]:
+        for attempt in range(1, DASHBOARD_GENERATION_ATTEMPTS + 1):
+            try:
+                data = await self._generate()
+            except Exception as e:
+                logger.error(f"Dashboard generation for {date} failed (attempt {attempt}): {e}")
+                if attempt < DASHBOARD_GENERATION_ATTEMPTS:
+                    await asyncio.sleep(min(2 ** attempt, 30))
+                continue
+            data = dict(data)
+            data["date"] = datetime.strptime(date, "%Y-%m-%d").isoformat()
+            await self._collection.update_one(
+                {"date": date},
+                {"$set": {"date": date, "data": data, "generated_at": datetime.utcnow(), "generated_by": self.worker_id}},
+                upsert=True
+            )
+            self._remember(date, data)
+            self.generated += 1
+            return data
+        self.failures += 1
+        return None
+
+    async def _acquire_lease(self, date: str) -> bool:
+        now = datetime.utcnow()
+        try:
+            # Matches an expired (or our own) lease; otherwise the upsert
+            # collides on _id and the lease belongs to someone else.
+            await self._collection.update_one(
+                {"_id": f"lease:{date}", "$or": [{"expires_at": {"$lte": now}}, {"owner": self.worker_id}]},
+                {"$set": {
+                    "lease_date": date,
+                    "owner": self.worker_id,
+                    "expires_at": now + timedelta(seconds=self.lease_seconds),
+                }, "$unset": {"failed": ""}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def _hold_failed_lease(self, date: str) -> None:
+        """Keep the lease through the cool-down so other workers stop retrying too"""
+        try:
+            await self._collection.update_one(
+                {"_id": f"lease:{date}", "owner": self.worker_id},
+                {"$set": {
+                    "failed": True,
+                    "expires_at": datetime.utcnow() + timedelta(seconds=DASHBOARD_FAILURE_COOLDOWN_SECONDS),
+                }}
+            )
+        except Exception as e:
+            logger.error(f"Dashboard lease update error for {date}: {e}")
+
+    async def _failed_lease_remaining(self, date: str) -> float:
+        lease = await self._collection.find_one({"_id": f"lease:{date}"}, {"failed": 1, "expires_at": 1})
+        if not lease or not lease.get("failed") or not lease.get("expires_at"):
+            return 0.0
+        return (lease["expires_at"] - datetime.utcnow()).total_seconds()
+
+    async def _release_lease(self, date: str) -> None:
+        try:
+            await self._collection.delete_one({"_id": f"lease:{date}", "owner": self.worker_id})
+        except Exception as e:
+            logger.error(f"Dashboard lease release error for {date}: {e}")
+
+    def _remember(self, date: str, data: Dict[str, Any]) -> None:
+        self._memo[date] = data
+        for stale in sorted(self._memo)[:-2]:
+            del self._memo[stale]
+
+    def _seconds_until_pregeneration(self) -> float:
+        now = datetime.now()
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        run_at = midnight - timedelta(minutes=self.lead_minutes)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return (run_at - now).total_seconds()
+
+    async def _ensure_with_retries(self, date: str) -> None:
+        """Keep trying until the date has a dashboard or has passed"""
+        while date >= dashboard_date():
+            try:
+                if await self.ensure(date) is not None:
+                    return
+            except Exception as e:
+                logger.error(f"Dashboard generation error for {date}: {e}")
+            await asyncio.sleep(DASHBOARD_FAILURE_COOLDOWN_SECONDS)
+
+    async def run(self) -> None:
+        """Make sure today's dashboard exists, then pre-generate each next day"""
+        await self._ensure_with_retries(dashboard_date())
+        while True:
+            await asyncio.sleep(self._seconds_until_pregeneration())
+            await self._ensure_with_retries(dashboard_date(1))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "memoized_dates": sorted(self._memo),
+            "cooling_down": sorted(date for date in list(self._cooldowns) if self.cooling_down(date)),
+            "generated": self.generated,
+            "failures": self.failures,
+        }
@@ -0,0 +1,120 @@
+"""
+Highlight rollups for Ayumi
+One document per (user, book) holding highlight counts per chapter, per
+color and per chapter/color, kept current with $inc as highlights are
+created, recolored and deleted. A user's heatmap reads one small document
+per highlighted book instead of every highlight.
+"""
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# (user_id, book, chapter, color_id)
+RollupKey = Tuple[str, str, int, str]
+
+
+def highlight_key(doc: Dict[str, Any]) -> RollupKey:
+    return doc["user_id"], doc["book"], int(doc["chapter"]), doc["color_id"]
+
+
+class RollupDeltas:
+    """Accumulates +1/-1 highlight changes and applies them in one bulk write"""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+
+    def add(self, doc: Dict[str, Any], delta: int = 1) -> None:
+        self._counts[highlight_key(doc)] += delta
+
+    def remove(self, doc: Dict[str, Any]) -> None:
+        self.add(doc, -1)
+
+    def recolor(self, doc: Dict[str, Any], color_id: str) -> None:
+        if color_id != doc["color_id"]:
+            self.remove(doc)
+            self.add(dict(doc, color_id=color_id))
+
+    def __bool__(self) -> bool:
+        return any(self._counts.values())
+
+    def _updates(self) -> List[UpdateOne]:
+        books: Dict[Tuple[str, str], Dict[str, int]] = {}
+        for (user_id, book, chapter, color_id), delta in self._counts.items():
+            if not delta:
+                continue
+            inc = books.setdefault((user_id, book), {})
+            for field in ("total", f"chapters.{chapter}", f"colors.{color_id}", f"chapter_colors.{chapter}.{color_id}"):
+                inc[field] = inc.get(field, 0) + delta
+        return [
+            UpdateOne({"user_id": user_id, "book": book}, {"$inc": inc}, upsert=True)
+            for (user_id, book), inc in books.items()
+        ]
+
+    async def apply(self, collection) -> int:
+        """Write the accumulated deltas and return the number of rollups touched.
+
+        Rollups that drop to zero are removed.
+        """
+        updates = self._updates()
+        if not updates:
+            return 0
+        await collection.bulk_write(updates, ordered=False)
+        users = sorted({key[0] for key, delta in self._counts.items() if delta < 0})
+        if users:
+            await collection.delete_many({"user_id": {"$in": users}, "total": {"$lte": 0}})
+        self._counts.clear()
+        return len(updates)
+
+
+async def apply_safely(collection, deltas: RollupDeltas) -> None:
+    """Apply deltas without failing the request that produced them"""
+    try:
+        await deltas.apply(collection)
+    except Exception as e:
+        # The highlight write already succeeded; a rebuild repairs the drift
+        logger.error(f"Highlight rollup update error: {e}")
+
+
+def _positive(counts: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {key: value for key, value in (counts or {}).items() if value > 0}
+
+
+async def get_heatmap(collection, user_id: str) -> Dict[str, Any]:
+    """Per-book highlight counts for a user, most highlighted book first"""
+    books = []
+    async for doc in collection.find({"user_id": user_id, "total": {"$gt": 0}}, {"_id": 0, "user_id": 0}):
+        books.append({
+            "book": doc["book"],
+            "total": doc["total"],
+            "chapters": _positive(doc.get("chapters")),
+            "colors": _positive(doc.get("colors")),
+            "chapter_colors": {
+                chapter: _positive(colors) for chapter, colors in (doc.get("chapter_colors") or {}).items()
+                if _positive(colors)
+            },
+        })
+    books.sort(key=lambda b: (-b["total"], b["book"]))
+    return {"user_id": user_id, "total": sum(b["total"] for b in books), "books": books}
+
+
+async def rebuild(db, user_ids: Optional[Iterable[str]] = None) -> int:
+    """Recompute rollups from the highlights collection (all users when none are given)"""
+    match: Dict[str, Any] = {}
+    if user_ids is not None:
+        match["user_id"] = {"$in": list(user_ids)}
+    pipeline = [
+        {"$match": match},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "book": "$book", "chapter": "$chapter", "color_id": "$color_id"},
+            "count": {"$sum": 1},
+        }},
+    ]
+    deltas = RollupDeltas()
+    async for row in db.highlights.aggregate(pipeline, allowDiskUse=True):
+        deltas.add(row["_id"], row["count"])
+    await db.highlight_rollups.delete_many(match)
+    return await deltas.apply(db.highlight_rollups)
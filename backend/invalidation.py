@@ -0,0 +1,221 @@
+"""
+Cross-worker cache invalidation for Ayumi
+Watches Mongo change streams on the collections behind in-process caches and
+calls the registered handler for every changed document, so each worker
+evicts its stale entries. A subscriber can take inserts separately (a new
+document cannot be stale anywhere) and limit updates to the fields it
+needs, so large documents are not shipped to every worker. Change streams
+need a replica set; on a standalone server the bus falls back to polling
+per-collection version counters that writers bump with publish(). Each bump
+also appends the changed document's identifying fields to a short log kept
+in the same counter document, so pollers evict just those entries; only a
+poller that fell further behind than the log clears the whole cache.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_POLL_SECONDS = float(os.getenv('INVALIDATION_POLL_SECONDS', '2'))
+VERSIONS_COLLECTION = "cache_versions"
+# Changes remembered per collection for polling workers
+INVALIDATION_LOG_SIZE = int(os.getenv('INVALIDATION_LOG_SIZE', '1000'))
+
+# Called with the changed document (None when only its _id is known, e.g.
+# after a delete or a publish() without a document, meaning "drop everything")
+Handler = Callable[[Optional[Dict[str, Any]]], None]
+
+_CHANGE_STREAMS_UNSUPPORTED = (40573,)  # "$changeStream is only supported on replica sets"
+
+
+class InvalidationBus:
+    """Evicts local cache entries when another worker changes the data behind them"""
+
+    def __init__(self, poll_seconds: float = INVALIDATION_POLL_SECONDS, log_size: int = INVALIDATION_LOG_SIZE):
+        self._db = None
+        self.log_size = max(1, log_size)
+        # Tags this worker's own log entries, whose caches are already current
+        self.worker_id = uuid.uuid4().hex
+        self._handlers: Dict[str, Handler] = {}
+        self._insert_handlers: Dict[str, Handler] = {}
+        self._fields: Dict[str, Sequence[str]] = {}
+        self.poll_seconds = poll_seconds
+        self.mode = "stopped"
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._versions: Dict[str, int] = {}
+        self.events = 0
+        self.errors = 0
+
+    def attach(self, db) -> None:
+        self._db = db
+
+    def subscribe(self, collection_name: str, handler: Handler, on_insert: Optional[Handler] = None,
+                  fields: Optional[Sequence[str]] = None) -> None:
+        """Call handler on changes to collection_name.
+
+        With on_insert, inserted documents go there instead of to handler.
+        With fields, updated and replaced documents carry only those fields.
+        """
+        self._handlers[collection_name] = handler
+        if on_insert is not None:
+            self._insert_handlers[collection_name] = on_insert
+        if fields:
+            self._fields[collection_name] = tuple(fields)
+
+    async def start(self) -> None:
+        """Watch change streams if the deployment supports them, otherwise poll"""
+        if self._tasks:
+            return
+        if await self._change_streams_supported():
+            self.mode = "change_streams"
+            for name in self._handlers:
+                self._tasks[name] = asyncio.create_task(self._watch(name))
+        else:
+            self.mode = "polling"
+            self._versions = await self._read_versions()
+            self._tasks["poll"] = asyncio.create_task(self._poll())
+        logger.info(f"Cache invalidation running in {self.mode} mode")
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self.mode = "stopped"
+
+    async def publish(self, collection_name: str, doc: Optional[Dict[str, Any]] = None) -> None:
+        """Tell polling workers that collection changed (a no-op under change streams).
+
+        doc holds the identifying fields handlers need (e.g. {"user_id": ...});
+        without it every worker clears its whole cache.
+        """
+        if self.mode == "change_streams":
+            return
+        entry = {"doc": doc, "origin": self.worker_id}
+        try:
+            # Counter and log change in one atomic update, so the last entry
+            # always belongs to the current version
+            await self._db[VERSIONS_COLLECTION].update_one(
+                {"_id": collection_name},
+                {"$inc": {"version": 1}, "$push": {"log": {"$each": [entry], "$slice": -self.log_size}}},
+                upsert=True
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Cache version publish error for {collection_name}: {e}")
+
+    async def _change_streams_supported(self) -> bool:
+        name = next(iter(self._handlers), None)
+        if name is None:
+            return False
+        try:
+            async with self._db[name].watch(max_await_time_ms=1) as stream:
+                await stream.try_next()
+            return True
+        except Exception as e:
+            # Polling is always correct, just coarser; use it whenever the probe fails
+            if not (isinstance(e, OperationFailure) and e.code in _CHANGE_STREAMS_UNSUPPORTED):
+                logger.warning(f"Change stream probe failed, polling instead: {e}")
+            return False
+
+    def _dispatch(self, name: str, doc: Optional[Dict[str, Any]], handler: Optional[Handler] = None) -> None:
+        self.events += 1
+        try:
+            (handler or self._handlers[name])(doc)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Cache invalidation handler error for {name}: {e}")
+
+    def _pipeline(self, name: str) -> list:
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+        fields = self._fields.get(name)
+        if fields:
+            # Trimmed on the server; inserts keep the document they carry anyway
+            trimmed = {field: f"$fullDocument.{field}" for field in fields}
+            pipeline.append({"$set": {"fullDocument": {
+                "$cond": [{"$eq": ["$operationType", "insert"]}, "$fullDocument", trimmed]
+            }}})
+        return pipeline
+
+    async def _watch(self, name: str) -> None:
+        resume_token = None
+        pipeline = self._pipeline(name)
+        on_insert = self._insert_handlers.get(name)
+        while True:
+            try:
+                async with self._db[name].watch(
+                    pipeline, full_document="updateLookup", resume_after=resume_token
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        # A trimmed delete arrives as an empty document
+                        doc = change.get("fullDocument") or None
+                        if on_insert is not None and change["operationType"] == "insert":
+                            self._dispatch(name, doc, on_insert)
+                        else:
+                            self._dispatch(name, doc)
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                self.errors += 1
+                logger.error(f"Change stream on {name} interrupted: {e}")
+                # Changes may have been missed while disconnected
+                self._dispatch(name, None)
+                if isinstance(e, OperationFailure) and e.code == 286:  # ChangeStreamHistoryLost
+                    resume_token = None
+                await asyncio.sleep(1.0)
+
+    async def _read_versions(self) -> Dict[str, int]:
+        return {
+            doc["_id"]: doc.get("version", 0)
+            async for doc in self._db[VERSIONS_COLLECTION].find(
+                {"_id": {"$in": list(self._handlers)}}, {"version": 1}
+            )
+        }
+
+    async def _catch_up(self, name: str) -> None:
+        """Replay the log entries published since this worker last saw name"""
+        doc = await self._db[VERSIONS_COLLECTION].find_one({"_id": name})
+        if doc is None:
+            return
+        version = doc.get("version", 0)
+        missed = version - self._versions.get(name, 0)
+        log = doc.get("log") or []
+        recent = log[-missed:] if missed > 0 else []
+        if missed > len(log) or any(entry.get("doc") is None for entry in recent):
+            # Fell behind the log, or a writer asked for a full clear
+            self._dispatch(name, None)
+        else:
+            for entry in recent:
+                if entry.get("origin") != self.worker_id:
+                    self._dispatch(name, entry["doc"])
+        self._versions[name] = version
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                versions = await self._read_versions()
+                for name, version in versions.items():
+                    if self._versions.get(name, 0) != version:
+                        await self._catch_up(name)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Cache version poll error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "collections": sorted(self._handlers),
+            "events": self.events,
+            "errors": self.errors,
+        }
+
+
+invalidation_bus = InvalidationBus()
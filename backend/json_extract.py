@@ -0,0 +1,204 @@
+"""
+JSON extraction for LLM responses
+Finds the JSON payload anywhere in a response (code fences, preamble and
+trailing prose are ignored), parses token streams incrementally, and salvages
+the complete elements of a truncated top-level array. A truncated object is
+an error: the values nested in it are fragments, not the payload.
+"""
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# strict=False accepts raw control characters (e.g. newlines) inside strings,
+# which models emit regularly
+_decoder = json.JSONDecoder(strict=False)
+
+
+def _decode(fragment: str) -> Any:
+    value, end = _decoder.raw_decode(fragment.strip())
+    return value
+
+
+class IncrementalJSONParser:
+    """Incrementally parse a streamed JSON value.
+
+    Text before the first '[' or '{' is skipped. When the root is an array,
+    each top-level element is returned from feed() as soon as it is complete.
+    Once the root closes, `complete` is set and `value` holds the full value.
+    """
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.complete = False
+        self.value: Any = None
+        self.root: Optional[str] = None
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk and return the array elements it completed"""
+        if self.complete:
+            return []
+        self._buffer += chunk
+        buffer = self._buffer
+        completed: List[Any] = []
+        i = self._pos
+
+        if self.root is None:
+            starts = [p for p in (buffer.find('[', i), buffer.find('{', i)) if p != -1]
+            if not starts:
+                self._buffer, self._pos = "", 0
+                return completed
+            i = min(starts)
+            buffer = self._buffer = buffer[i:]
+            i = 0
+
+        while i < len(buffer):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self.root == '[' and self._item_start is not None \
+                            and buffer[self._item_start] == '"':
+                        self._emit(buffer[self._item_start:i + 1], completed)
+            elif ch == '"':
+                self._in_string = True
+                self._mark_item(i)
+            elif ch in '[{':
+                if self.root is None:
+                    self.root = ch
+                else:
+                    self._mark_item(i)
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 1 and self.root == '[' and self._item_start is not None:
+                    self._emit(buffer[self._item_start:i + 1], completed)
+                elif self._depth == 0:
+                    if self._item_start is not None:
+                        self._emit(buffer[self._item_start:i], completed)
+                    self._finish(buffer[:i + 1])
+                    return completed
+            elif ch == ',' and self._depth == 1 and self.root == '[':
+                if self._item_start is not None:
+                    self._emit(buffer[self._item_start:i], completed)
+            elif not ch.isspace():
+                self._mark_item(i)
+            i += 1
+
+        # Object roots are decoded whole at the end, so keep all of their text;
+        # array roots only need the element currently being read
+        if self.root == '[':
+            keep_from = self._item_start if self._item_start is not None else len(buffer)
+            self._buffer = buffer[keep_from:]
+            self._pos = len(buffer) - keep_from
+            if self._item_start is not None:
+                self._item_start = 0
+        else:
+            self._pos = len(buffer)
+        return completed
+
+    def _mark_item(self, i: int) -> None:
+        if self._depth == 1 and self.root == '[' and self._item_start is None:
+            self._item_start = i
+
+    def _emit(self, fragment: str, completed: List[Any]) -> None:
+        self._item_start = None
+        try:
+            item = _decode(fragment)
+        except ValueError:
+            logger.warning(f"Skipping malformed array element: {fragment[:80]!r}")
+            return
+        self.items.append(item)
+        completed.append(item)
+
+    def _finish(self, text: str) -> None:
+        self.complete = True
+        self._buffer = ""
+        if self.root == '[':
+            self.value = self.items
+        else:
+            self.value = _decode(text)
+
+
+def _closing_bracket(text: str, start: int) -> Optional[int]:
+    """Index of the bracket closing the one at start, or None if the text ends first"""
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '[{':
+            depth += 1
+        elif ch in ']}':
+            depth -= 1
+            if depth == 0:
+                return i
+    return None
+
+
+def extract_json(text: str) -> Any:
+    """Extract the JSON payload from an LLM response.
+
+    Returns the longest JSON object or array found in the text. A truncated
+    array falls back to its complete elements; ValueError is raised when
+    nothing can be recovered, including for a truncated object.
+    """
+    return extract_json_payload(text)[0]
+
+
+def extract_json_payload(text: str) -> Tuple[Any, bool]:
+    """Like extract_json, but also reports whether the payload was complete
+    (False when elements were salvaged from a truncated or damaged array)"""
+    best = None
+    best_span = 0
+    i = 0
+    length = len(text)
+    while i < length:
+        ch = text[i]
+        if ch not in '[{':
+            i += 1
+            continue
+        try:
+            value, end = _decoder.raw_decode(text, i)
+        except ValueError:
+            close = _closing_bracket(text, i)
+            if ch == '[':
+                # Keep whatever elements of a damaged or truncated array are complete
+                parser = IncrementalJSONParser()
+                parser.feed(text[i:] if close is None else text[i:close + 1])
+                if parser.items:
+                    logger.warning(f"Salvaged {len(parser.items)} elements from a damaged JSON array")
+                    return parser.items, False
+            if close is None:
+                # It runs to the end of the text, so it is the payload, cut off
+                raise ValueError("Truncated JSON payload in response")
+            # Damaged but closed (e.g. "{braces}" in prose): skip it whole,
+            # never the values nested inside it
+            i = close + 1
+            continue
+        if end - i > best_span:
+            best, best_span = value, end - i
+        i = end
+
+    if not best_span:
+        raise ValueError("No JSON payload found in response")
+    return best, True
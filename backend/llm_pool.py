@@ -0,0 +1,88 @@
+"""
+Bounded LLM client layer for Ayumi
+Caps the number of concurrent upstream LLM calls and sheds load with
+LLMOverloaded once too many calls are already queued.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from emergentintegrations.llm.chat import UserMessage
+
+try:
+    from anthropic import AsyncAnthropic
+except ImportError:  # streaming falls back to one-shot responses
+    AsyncAnthropic = None
+
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '16'))
+LLM_MAX_QUEUE = int(os.getenv('LLM_MAX_QUEUE', '64'))
+
+
+class LLMOverloaded(Exception):
+    """Raised when too many LLM calls are already waiting for a slot"""
+
+
+class LLMClientPool:
+    """Concurrency-limited access to the LLM clients.
+
+    LlmChat instances carry per-session conversation state, so one is built
+    per call through `chat_factory`; the Anthropic streaming client holds an
+    HTTP connection pool and is shared by every call.
+    """
+
+    def __init__(self, chat_factory: Callable[[str], Any],
+                 max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 max_queue: int = LLM_MAX_QUEUE):
+        self._chat_factory = chat_factory
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._anthropic = None
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the concurrency slots, queueing up to max_queue callers"""
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise LLMOverloaded(f"LLM queue is full ({self.waiting} waiting)")
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def send(self, session_id: str, prompt: str) -> str:
+        """Send a single prompt and return the complete response text"""
+        async with self.slot():
+            chat = self._chat_factory(session_id)
+            return await chat.send_message(UserMessage(text=prompt))
+
+    def anthropic_client(self, api_key: str) -> Optional[Any]:
+        """Shared AsyncAnthropic client, or None when the SDK is not installed"""
+        if AsyncAnthropic is None:
+            return None
+        if self._anthropic is None:
+            self._anthropic = AsyncAnthropic(api_key=api_key)
+        return self._anthropic
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,277 @@
+"""
+Schema migrations for Ayumi
+Versioned, idempotent Mongo index bootstrapping run at startup. Applied
+versions are recorded in the schema_migrations collection; every step is
+safe to re-run, so workers starting together do not need to coordinate.
+
+Apply pending migrations and show which index serves the hot queries:
+    python migrations.py [check]
+"""
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+
+# Status checks older than this are removed by Mongo's TTL monitor
+STATUS_CHECK_RETENTION_SECONDS = int(float(os.getenv('STATUS_CHECK_RETENTION_DAYS', '7')) * 86400)
+
+# Journal entries written before entries had owners are assigned to this user
+LEGACY_JOURNAL_USER_ID = os.getenv('LEGACY_JOURNAL_USER_ID', 'legacy')
+
+Migration = Tuple[int, str, Callable[[Any], Awaitable[None]]]
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, description: str):
+    """Register a migration step; versions must be unique and are applied in order"""
+    def register(fn: Callable[[Any], Awaitable[None]]):
+        if any(existing == version for existing, _, _ in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+async def _dedupe(collection, field: str) -> int:
+    """Keep only the most recently inserted document per value of field"""
+    removed = 0
+    pipeline = [
+        {"$match": {field: {"$exists": True}}},
+        {"$group": {"_id": f"${field}", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    async for group in collection.aggregate(pipeline, allowDiskUse=True):
+        # ObjectIds grow with insertion time; keep the newest
+        stale = sorted(group["ids"])[:-1]
+        result = await collection.delete_many({"_id": {"$in": stale}})
+        removed += result.deleted_count
+    if removed:
+        logger.info(f"Removed {removed} duplicate {collection.name} documents by {field}")
+    return removed
+
+
+@migration(1, "highlights: user/chapter lookup and unique id")
+async def _highlight_indexes(db) -> None:
+    await db.highlights.create_index(
+        [("user_id", ASCENDING), ("book", ASCENDING), ("chapter", ASCENDING)], name="user_book_chapter"
+    )
+    await db.highlights.create_index([("id", ASCENDING)], name="id_unique", unique=True)
+
+
+@migration(2, "settings: one document per user")
+async def _settings_indexes(db) -> None:
+    # Concurrent first reads of get_settings could insert duplicate defaults
+    await _dedupe(db.settings, "user_id")
+    await db.settings.create_index([("user_id", ASCENDING)], name="user_id_unique", unique=True)
+
+
+@migration(3, "journal_entries: unique id and date ordering")
+async def _journal_indexes(db) -> None:
+    await _dedupe(db.journal_entries, "id")
+    await db.journal_entries.create_index([("id", ASCENDING)], name="id_unique", unique=True)
+    await db.journal_entries.create_index([("date", DESCENDING)], name="date_desc")
+
+
+@migration(4, "cached_dashboards: one dashboard per date")
+async def _dashboard_indexes(db) -> None:
+    # Lease documents share the collection and have no date field
+    await _dedupe(db.cached_dashboards, "date")
+    await db.cached_dashboards.create_index([("date", ASCENDING)], name="date_unique", unique=True, sparse=True)
+
+
+@migration(5, "status_checks: timestamp ordering")
+async def _status_indexes(db) -> None:
+    await db.status_checks.create_index([("timestamp", DESCENDING)], name="timestamp_desc")
+
+
+@migration(6, "bible_chapters: unique chapter key")
+async def _chapter_indexes(db) -> None:
+    await _dedupe(db.bible_chapters, "key")
+    await db.bible_chapters.create_index([("key", ASCENDING)], name="key_unique", unique=True)
+
+
+@migration(7, "highlights: keyset pagination order")
+async def _highlight_keyset_indexes(db) -> None:
+    await db.highlights.create_index(
+        [("user_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], name="user_created"
+    )
+    await db.highlights.create_index(
+        [("user_id", ASCENDING), ("book", ASCENDING), ("chapter", ASCENDING),
+         ("created_at", ASCENDING), ("id", ASCENDING)],
+        name="user_chapter_created"
+    )
+    # Its key is a prefix of user_chapter_created
+    await _drop_index(db.highlights, "user_book_chapter")
+
+
+@migration(8, "journal_entries: per-user ids, timeline and full-text search")
+async def _journal_user_indexes(db) -> None:
+    # Entries saved before they had owners would be unreachable through the
+    # per-user routes; they belonged to nobody in particular, so they move to
+    # one configurable owner (GET /api/journal/{LEGACY_JOURNAL_USER_ID}/entries)
+    result = await db.journal_entries.update_many(
+        {"user_id": {"$exists": False}}, {"$set": {"user_id": LEGACY_JOURNAL_USER_ID}}
+    )
+    if result.modified_count:
+        logger.info(f"Assigned {result.modified_count} ownerless journal entries to {LEGACY_JOURNAL_USER_ID!r}")
+    # Clients pick ids themselves (the web client uses Date.now()), so they are
+    # only unique per user
+    await db.journal_entries.create_index(
+        [("user_id", ASCENDING), ("id", ASCENDING)], name="user_entry_unique", unique=True
+    )
+    await db.journal_entries.create_index(
+        [("user_id", ASCENDING), ("date", DESCENDING), ("id", DESCENDING)], name="user_date"
+    )
+    await db.journal_entries.create_index(
+        [("title", TEXT), ("text", TEXT)], name="journal_text", weights={"title": 3, "text": 1}
+    )
+    await _drop_index(db.journal_entries, "date_desc")
+    await _drop_index(db.journal_entries, "id_unique")
+
+
+@migration(9, "highlight_rollups: per-user book rollups, backfilled")
+async def _highlight_rollups(db) -> None:
+    from highlight_rollups import rebuild
+
+    await db.highlight_rollups.create_index(
+        [("user_id", ASCENDING), ("book", ASCENDING)], name="user_book_unique", unique=True
+    )
+    await rebuild(db)
+
+
+@migration(10, "status_checks: expire by timestamp")
+async def _status_ttl(db) -> None:
+    await set_expiry(db, "status_checks", "timestamp", STATUS_CHECK_RETENTION_SECONDS)
+    await _drop_index(db.status_checks, "timestamp_desc")
+
+
+@migration(11, "bible_chapters: stored_at, for search index sync across workers")
+async def _chapter_stored_at_index(db) -> None:
+    await db.bible_chapters.create_index([("stored_at", ASCENDING)], name="stored_at")
+
+
+@migration(12, "status_checks: keyset pagination order")
+async def _status_keyset_index(db) -> None:
+    # The TTL index must stay single-field; pages sort on (timestamp, id)
+    await db.status_checks.create_index(
+        [("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id"
+    )
+
+
+async def set_expiry(db, collection_name: str, field: str, seconds: int) -> None:
+    """Create a TTL index on field, or change the retention of the existing one"""
+    try:
+        await db[collection_name].create_index([(field, ASCENDING)], name=f"{field}_ttl", expireAfterSeconds=seconds)
+    except OperationFailure as e:
+        if e.code not in (85, 86):  # IndexOptionsConflict / IndexKeySpecsConflict
+            raise
+        await db.command("collMod", collection_name, index={"name": f"{field}_ttl", "expireAfterSeconds": seconds})
+
+
+async def _drop_index(collection, name: str) -> None:
+    try:
+        await collection.drop_index(name)
+    except OperationFailure:
+        pass  # already gone
+
+
+async def run_migrations(db) -> List[int]:
+    """Apply every migration not yet recorded and return the versions applied"""
+    collection = db[MIGRATIONS_COLLECTION]
+    applied = {doc["_id"] async for doc in collection.find({}, {"_id": 1})}
+    ran = []
+    for version, description, fn in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info(f"Applying migration {version}: {description}")
+        await fn(db)
+        await collection.update_one(
+            {"_id": version},
+            {"$set": {"description": description, "applied_at": datetime.utcnow()}},
+            upsert=True
+        )
+        ran.append(version)
+    # Retention is configuration, not schema: apply the current setting every start
+    if 10 not in ran:
+        await set_expiry(db, "status_checks", "timestamp", STATUS_CHECK_RETENTION_SECONDS)
+    return ran
+
+
+def _index_names(plan: Any) -> List[str]:
+    if isinstance(plan, dict):
+        names = [plan["indexName"]] if plan.get("stage") == "IXSCAN" and "indexName" in plan else []
+        for value in plan.values():
+            names.extend(_index_names(value))
+        return names
+    if isinstance(plan, list):
+        return [name for item in plan for name in _index_names(item)]
+    return []
+
+
+async def winning_index(collection, query: Dict[str, Any],
+                        sort: Optional[List[Tuple[str, int]]] = None) -> Optional[str]:
+    """Name of the index the query planner picks for a find, or None for a collection scan"""
+    cursor = collection.find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    explain = await cursor.explain()
+    names = _index_names(explain.get("queryPlanner", {}).get("winningPlan", {}))
+    return names[0] if names else None
+
+
+# Hot queries from server.py and the index each one should use
+INDEX_CHECKS = [
+    ("highlights", {"user_id": "u", "book": "John", "chapter": 3},
+     [("created_at", ASCENDING), ("id", ASCENDING)], "user_chapter_created"),
+    ("highlights", {"user_id": "u"}, [("created_at", ASCENDING), ("id", ASCENDING)], "user_created"),
+    ("highlights", {"id": "x"}, None, "id_unique"),
+    ("settings", {"user_id": "u"}, None, "user_id_unique"),
+    ("journal_entries", {"user_id": "u", "id": "x"}, None, "user_entry_unique"),
+    ("journal_entries", {"user_id": "u"}, [("date", DESCENDING), ("id", DESCENDING)], "user_date"),
+    ("cached_dashboards", {"date": "2024-01-01"}, None, "date_unique"),
+    ("bible_chapters", {"key": "ESV:john:3"}, None, "key_unique"),
+    ("bible_chapters", {"stored_at": {"$gte": datetime(2024, 1, 1)}}, None, "stored_at"),
+    ("status_checks", {}, [("timestamp", DESCENDING), ("id", DESCENDING)], "timestamp_id"),
+]
+
+
+async def check_indexes(db) -> List[Dict[str, Any]]:
+    """Explain each hot query and report whether it uses its expected index"""
+    report = []
+    for name, query, sort, expected in INDEX_CHECKS:
+        used = await winning_index(db[name], query, sort)
+        report.append({"collection": name, "query": query, "expected": expected, "used": used, "ok": used == expected})
+    return report
+
+
+async def _main(check: bool) -> None:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        db = client[os.environ['DB_NAME']]
+        ran = await run_migrations(db)
+        print(f"✓ Applied migrations: {ran or 'none pending'}")
+        if check:
+            for row in await check_indexes(db):
+                mark = "✓" if row["ok"] else "✗"
+                print(f"{mark} {row['collection']} {row['query']} -> {row['used'] or 'COLLSCAN'}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(len(sys.argv) > 1 and sys.argv[1] == "check"))
@@ -0,0 +1,87 @@
+"""
+Keyset pagination helpers for Ayumi
+Pages are addressed by an opaque cursor holding the sort key of the last
+document returned, so each page is one bounded index range scan instead of
+a growing skip.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PAGE_SIZE_DEFAULT = 100
+PAGE_SIZE_MAX = 1000
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    # Cursors come from clients and end up in a query, so anything that could
+    # be an operator document ({"$ne": null}) or an array is rejected
+    if isinstance(value, dict):
+        if value.keys() == {"$date"} and isinstance(value["$date"], str):
+            return datetime.fromisoformat(value["$date"])
+        raise ValueError("Invalid cursor")
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise ValueError("Invalid cursor")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque, URL-safe cursor for a sort key"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Sort key from a cursor; raises ValueError when it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return [_decode_value(v) for v in values]
+
+
+def clamp_limit(limit: Optional[int], default: int = PAGE_SIZE_DEFAULT, maximum: int = PAGE_SIZE_MAX) -> int:
+    """Page size capped at maximum (default when not given); raises ValueError below 1"""
+    if limit is None:
+        return min(default, maximum)
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    return min(limit, maximum)
+
+
+def keyset_filter(sort: Sequence[Tuple[str, int]], after: Sequence[Any]) -> Dict[str, Any]:
+    """Filter matching documents that sort strictly after the given key.
+
+    For sort [(a, 1), (b, 1)] and key (x, y): a > x OR (a == x AND b > y).
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev: after[j] for j, (prev, _) in enumerate(sort[:i])}
+        clause[field] = {"$gt" if direction > 0 else "$lt": after[i]}
+        clauses.append(clause)
+    return {"$or": clauses} if len(clauses) > 1 else clauses[0]
+
+
+async def fetch_page(collection, query: Dict[str, Any], sort: List[Tuple[str, int]], limit: int,
+                     cursor: Optional[str] = None,
+                     projection: Optional[Dict[str, int]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of documents and the cursor for the next page (None on the last page)"""
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor, len(sort)))]}
+    if projection is None:
+        projection = {"_id": 0}
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    last = docs[-1]
+    return docs, encode_cursor([last.get(field) for field, _ in sort])
@@ -0,0 +1,257 @@
+"""
+Local full-text Bible search for Ayumi
+A BM25-ranked inverted index over the stored chapter text, one per version,
+with light stemming and quoted phrase queries. Chapters are indexed as the
+chapter store receives them; chapters other workers store arrive through the
+bible_chapters change stream or, on a standalone server, by polling for
+documents with a newer stored_at.
+"""
+import asyncio
+import logging
+import math
+import os
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from chapter_store import make_chapter_key
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SEARCH_INDEX_SYNC_SECONDS = float(os.getenv('SEARCH_INDEX_SYNC_SECONDS', '10'))
+# Polls re-read this far behind the newest stored_at seen, so writes that
+# commit late or come from a worker with a lagging clock are not skipped
+SEARCH_INDEX_SYNC_OVERLAP = timedelta(seconds=float(os.getenv('SEARCH_INDEX_SYNC_OVERLAP_SECONDS', '60')))
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_PHRASE_RE = re.compile(r'"([^"]+)"')
+
+
+def stem(word: str) -> str:
+    """Light English suffix stripping (including KJV -eth/-est forms)"""
+    if len(word) <= 3 or not word.isascii():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("sses"):
+        word = word[:-2]
+    else:
+        for suffix in ("ingly", "edly", "ness", "ment", "ing", "eth", "est", "ed", "ly"):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                    word = word[:-1]
+                break
+        else:
+            if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+                word = word[:-1]
+    # love / loves / loved / loveth all reduce to "lov"
+    if len(word) >= 4 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(token) for token in _TOKEN_RE.findall(text.lower())]
+
+
+class VersionIndex:
+    """Inverted index with positions for a single Bible version"""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, List[int]]] = defaultdict(dict)
+        self.doc_lengths: Dict[int, int] = {}
+        self.docs: Dict[int, Dict[str, Any]] = {}
+        self.chapters: Dict[str, List[int]] = {}
+        self.total_length = 0
+        self._next_id = 0
+
+    def add_chapter(self, key: str, book: str, chapter: int, verses: List[Dict[str, Any]]) -> None:
+        """Index a chapter, replacing any earlier copy of it"""
+        self.remove_chapter(key)
+        doc_ids = []
+        for verse in verses:
+            text = verse.get("text") if isinstance(verse, dict) else None
+            if not text:
+                continue
+            doc_id = self._next_id
+            self._next_id += 1
+            tokens = tokenize(text)
+            for position, token in enumerate(tokens):
+                self.postings[token].setdefault(doc_id, []).append(position)
+            self.doc_lengths[doc_id] = len(tokens)
+            self.total_length += len(tokens)
+            self.docs[doc_id] = {
+                "book": verse.get("book", book),
+                "chapter": verse.get("chapter", chapter),
+                "verse": verse.get("verse"),
+                "text": text,
+            }
+            doc_ids.append(doc_id)
+        self.chapters[key] = doc_ids
+
+    def remove_chapter(self, key: str) -> None:
+        for doc_id in self.chapters.pop(key, []):
+            text = self.docs.pop(doc_id)["text"]
+            for token in set(tokenize(text)):
+                postings = self.postings.get(token)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self.postings[token]
+            self.total_length -= self.doc_lengths.pop(doc_id)
+
+    def _has_phrase(self, doc_id: int, phrase: List[str]) -> bool:
+        try:
+            position_lists = [self.postings[token][doc_id] for token in phrase]
+        except KeyError:
+            return False
+        following = [set(positions) for positions in position_lists[1:]]
+        return any(
+            all(start + offset + 1 in positions for offset, positions in enumerate(following))
+            for start in position_lists[0]
+        )
+
+    def search(self, terms: List[str], phrases: List[List[str]], limit: int) -> List[Tuple[float, int]]:
+        """Return (score, doc_id) pairs ranked by BM25"""
+        n_docs = len(self.docs)
+        if not n_docs or not terms:
+            return []
+        avg_length = self.total_length / n_docs
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, positions in postings.items():
+                tf = len(positions)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        if phrases:
+            scores = {
+                doc_id: score for doc_id, score in scores.items()
+                if all(self._has_phrase(doc_id, phrase) for phrase in phrases)
+            }
+        ranked = sorted(((score, doc_id) for doc_id, score in scores.items()), reverse=True)
+        return ranked[:limit]
+
+
+class BibleSearchIndex:
+    """Per-version full-text indexes over stored chapters"""
+
+    def __init__(self):
+        self._versions: Dict[str, VersionIndex] = {}
+        # chapter key -> stored_at of the indexed copy (None for chapters this
+        # worker stored itself, which are current by construction)
+        self._stored_at: Dict[str, Optional[datetime]] = {}
+        self.watermark: Optional[datetime] = None
+        self.synced = 0
+
+    def _index(self, book: str, chapter: int, version: str, verses: List[Dict[str, Any]]) -> str:
+        version = version.strip().upper()
+        key = make_chapter_key(book, chapter, version)
+        self._versions.setdefault(version, VersionIndex()).add_chapter(key, book, chapter, verses)
+        return key
+
+    def add_chapter(self, book: str, chapter: int, version: str, verses: List[Dict[str, Any]]) -> None:
+        key = self._index(book, chapter, version, verses)
+        self._stored_at[key] = None
+
+    def _is_new(self, key: str, stored_at: Optional[datetime]) -> bool:
+        if key not in self._stored_at:
+            return True
+        seen = self._stored_at[key]
+        return seen is not None and stored_at is not None and stored_at > seen
+
+    def add_stored_chapter(self, doc: Dict[str, Any]) -> bool:
+        """Index a bible_chapters document unless the same or a newer copy is already indexed"""
+        key = make_chapter_key(doc["book"], doc["chapter"], doc["version"])
+        stored_at = doc.get("stored_at")
+        if not self._is_new(key, stored_at):
+            return False
+        self._index(doc["book"], doc["chapter"], doc["version"], doc.get("verses") or [])
+        self._stored_at[key] = stored_at
+        if stored_at is not None and (self.watermark is None or stored_at > self.watermark):
+            self.watermark = stored_at
+        return True
+
+    async def load_from(self, collection, query: Optional[Dict[str, Any]] = None) -> int:
+        """Index chapters in the chapter store collection (all, or those matching query)"""
+        projection = {"_id": 0, "book": 1, "chapter": 1, "version": 1, "verses": 1, "stored_at": 1}
+        count = 0
+        async for doc in collection.find(query or {}, projection):
+            try:
+                added = self.add_stored_chapter(doc)
+            except Exception as e:
+                logger.error(f"Search index load error for {doc.get('book')} {doc.get('chapter')}: {e}")
+                continue
+            if not added:
+                continue
+            count += 1
+            if count % 50 == 0:
+                # Let requests through while a large store is being indexed
+                await asyncio.sleep(0)
+        return count
+
+    async def sync_from(self, collection, since: datetime) -> int:
+        """Index chapters stored at or after since that are not indexed yet"""
+        stamps = collection.find({"stored_at": {"$gte": since}}, {"_id": 0, "key": 1, "stored_at": 1})
+        # Only the stamps are read for the overlap window; verses just for new chapters
+        keys = [doc["key"] async for doc in stamps if self._is_new(doc["key"], doc.get("stored_at"))]
+        if not keys:
+            return 0
+        return await self.load_from(collection, {"key": {"$in": keys}})
+
+    async def catch_up(self, collection, since: Optional[datetime] = None) -> None:
+        """Index chapters stored since the watermark (or since), e.g. after a change stream gap"""
+        since = self.watermark or since or datetime.utcnow()
+        try:
+            self.synced += await self.sync_from(collection, since - SEARCH_INDEX_SYNC_OVERLAP)
+        except Exception as e:
+            logger.error(f"Search index sync error: {e}")
+
+    async def follow(self, collection, interval: float = SEARCH_INDEX_SYNC_SECONDS) -> None:
+        """Poll for chapters stored by other workers"""
+        started = datetime.utcnow()
+        while True:
+            await asyncio.sleep(interval)
+            await self.catch_up(collection, started)
+
+    def search(self, query: str, version: str = "ESV", limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranked verse matches; quoted parts of the query must match as phrases"""
+        index = self._versions.get(version.strip().upper())
+        if index is None:
+            return []
+        phrases = [tokenize(phrase) for phrase in _PHRASE_RE.findall(query)]
+        phrases = [phrase for phrase in phrases if phrase]
+        terms = tokenize(query)
+        results = []
+        for score, doc_id in index.search(terms, phrases, limit):
+            doc = index.docs[doc_id]
+            results.append({
+                "text": doc["text"],
+                "reference": f"{doc['book']} {doc['chapter']}:{doc['verse']}",
+                "book": doc["book"],
+                "chapter": doc["chapter"],
+                "verse": doc["verse"],
+                "score": round(score, 4),
+            })
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "versions": {
+                version: {"chapters": len(index.chapters), "verses": len(index.docs), "terms": len(index.postings)}
+                for version, index in self._versions.items()
+            },
+            "synced": self.synced,
+        }
+
+
+search_index = BibleSearchIndex()
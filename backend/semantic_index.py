@@ -0,0 +1,257 @@
+"""
+Semantic verse search for Ayumi
+Verses are embedded offline into a contiguous float32 matrix that is memory
+mapped at startup; queries are answered with batched NumPy dot products.
+
+The embedding is computed locally with no network. The leading dimensions
+are topic concepts from a curated lexicon (e.g. "anxious", "worry" and
+"afraid" all signal "anxiety"); the rest hold signed feature hashes of
+stemmed words and word bigrams. Columns are weighted by corpus IDF. A learned
+model can be plugged in by replacing `embed_texts`.
+
+Build the index (reads the bible_chapters collection):
+    python semantic_index.py build [output_dir]
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from search_index import stem, tokenize
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 512
+INDEX_FORMAT_VERSION = 1
+SEMANTIC_INDEX_DIR = Path(os.getenv('SEMANTIC_INDEX_DIR', Path(__file__).parent / 'data' / 'semantic'))
+
+TOPIC_LEXICON = {
+    "anxiety": ["anxiety", "anxious", "worry", "afraid", "fear", "troubled", "distress", "care", "dismayed", "burden"],
+    "peace": ["peace", "rest", "still", "quiet", "calm", "comfort"],
+    "forgiveness": ["forgive", "forgiven", "forgiveness", "pardon", "transgression", "iniquity", "sin", "cleanse", "blot", "remission"],
+    "love": ["love", "beloved", "charity", "compassion", "lovingkindness", "steadfast"],
+    "mercy": ["mercy", "merciful", "grace", "gracious", "compassion", "pity"],
+    "faith": ["faith", "believe", "trust", "faithful", "confidence", "hope"],
+    "strength": ["strength", "strong", "power", "mighty", "might", "courage", "weary", "faint"],
+    "joy": ["joy", "rejoice", "glad", "gladness", "delight", "happy", "blessed"],
+    "grief": ["grief", "sorrow", "mourn", "weep", "tears", "lament", "brokenhearted"],
+    "salvation": ["salvation", "save", "saved", "savior", "redeem", "redeemer", "redemption", "deliver", "rescue"],
+    "prayer": ["pray", "prayer", "supplication", "petition", "cry", "call", "ask", "intercede"],
+    "wisdom": ["wisdom", "wise", "understanding", "knowledge", "discern", "instruction", "counsel"],
+    "guidance": ["guide", "lead", "path", "way", "direct", "shepherd", "lamp", "light"],
+    "provision": ["provide", "provision", "bread", "supply", "need", "want", "feed", "abundance"],
+    "protection": ["refuge", "fortress", "shield", "protect", "shelter", "rock", "stronghold", "keep", "guard"],
+    "healing": ["heal", "healed", "health", "restore", "sick", "disease", "wound", "physician"],
+    "temptation": ["tempt", "temptation", "test", "trial", "endure", "endurance", "flee"],
+    "anger": ["anger", "angry", "wrath", "rage", "fury", "temper"],
+    "pride": ["pride", "proud", "haughty", "arrogant", "humble", "humility", "lowly"],
+    "death": ["death", "die", "dead", "grave", "perish", "eternal", "resurrection", "life"],
+}
+
+# Concepts get dedicated (collision-free) columns ahead of the hashed ones
+_CONCEPT_COLUMNS = {concept: column for column, concept in enumerate(TOPIC_LEXICON)}
+_HASHED_DIM = EMBEDDING_DIM - len(_CONCEPT_COLUMNS)
+CONCEPT_WEIGHT = 2.0
+
+# stem -> concepts it signals
+_CONCEPTS: Dict[str, List[str]] = {}
+for _concept, _words in TOPIC_LEXICON.items():
+    for _word in _words:
+        _CONCEPTS.setdefault(stem(_word), []).append(_concept)
+
+
+def _features(text: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+    tokens = tokenize(text)
+    features: Dict[str, float] = {}
+    concepts: Dict[str, float] = {}
+    for i, token in enumerate(tokens):
+        features[f"w:{token}"] = features.get(f"w:{token}", 0.0) + 1.0
+        if i:
+            bigram = f"b:{tokens[i - 1]}_{token}"
+            features[bigram] = features.get(bigram, 0.0) + 0.5
+        for concept in _CONCEPTS.get(token, ()):
+            concepts[concept] = concepts.get(concept, 0.0) + 1.0
+    return features, concepts
+
+
+def _bucket(feature: str) -> Tuple[int, float]:
+    h = zlib.crc32(feature.encode("utf-8"))
+    return len(_CONCEPT_COLUMNS) + h % _HASHED_DIM, (1.0 if h & 0x80000000 else -1.0)
+
+
+def _damp(count: float) -> float:
+    return 1.0 + math.log(count) if count >= 1 else count
+
+
+def hash_texts(texts: Sequence[str]) -> np.ndarray:
+    """Raw (un-weighted) feature vectors, shape (n, EMBEDDING_DIM)"""
+    matrix = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        features, concepts = _features(text)
+        for feature, count in features.items():
+            column, sign = _bucket(feature)
+            matrix[row, column] += sign * _damp(count)
+        for concept, count in concepts.items():
+            matrix[row, _CONCEPT_COLUMNS[concept]] = CONCEPT_WEIGHT * _damp(count)
+    return matrix
+
+
+def embed_texts(texts: Sequence[str], idf: Optional[np.ndarray] = None) -> np.ndarray:
+    """L2-normalized float32 embeddings, shape (n, EMBEDDING_DIM)"""
+    matrix = hash_texts(texts)
+    if idf is not None:
+        matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def compute_idf(raw: np.ndarray) -> np.ndarray:
+    document_frequency = np.count_nonzero(raw, axis=0).astype(np.float32)
+    return np.log((1 + raw.shape[0]) / (1 + document_frequency)).astype(np.float32) + 1.0
+
+
+def build_index(chapters: Iterable[Dict[str, Any]], output_dir: Path = SEMANTIC_INDEX_DIR) -> int:
+    """Embed every verse of the given chapter documents and write the index files.
+
+    Rows are grouped by version so each version is one contiguous slice.
+    """
+    rows: List[List[Any]] = []
+    for doc in sorted(chapters, key=lambda d: d["version"]):
+        for verse in doc.get("verses") or []:
+            if isinstance(verse, dict) and verse.get("text"):
+                rows.append([doc["version"], verse.get("book", doc["book"]),
+                             verse.get("chapter", doc["chapter"]), verse.get("verse"), verse["text"]])
+
+    raw = hash_texts([row[4] for row in rows])
+    idf = compute_idf(raw) if rows else np.ones(EMBEDDING_DIM, dtype=np.float32)
+    vectors = np.ascontiguousarray(embed_texts([row[4] for row in rows], idf), dtype=np.float32)
+
+    versions: Dict[str, List[int]] = {}
+    for i, row in enumerate(rows):
+        versions.setdefault(row[0], [i, i])[1] = i + 1
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tmp = output_dir / "vectors.f32.tmp"
+    vectors.tofile(tmp)
+    os.replace(tmp, output_dir / "vectors.f32")
+    idf.astype(np.float32).tofile(output_dir / "idf.f32")
+    meta = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "dim": EMBEDDING_DIM,
+        "count": len(rows),
+        "versions": versions,
+        "rows": [row[1:] for row in rows],
+    }
+    tmp = output_dir / "meta.json.tmp"
+    tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, output_dir / "meta.json")
+    return len(rows)
+
+
+class SemanticIndex:
+    """Memory-mapped verse embedding matrix with batched top-k search"""
+
+    def __init__(self):
+        self.vectors: Optional[np.ndarray] = None
+        self.idf: Optional[np.ndarray] = None
+        self.rows: List[List[Any]] = []
+        self.versions: Dict[str, List[int]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self.vectors is not None and len(self.rows) > 0
+
+    def load(self, index_dir: Path = SEMANTIC_INDEX_DIR) -> bool:
+        """Memory-map a built index; returns False when none has been built"""
+        index_dir = Path(index_dir)
+        meta_path = index_dir / "meta.json"
+        if not meta_path.exists():
+            return False
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("format_version") != INDEX_FORMAT_VERSION or meta.get("dim") != EMBEDDING_DIM:
+            logger.error(f"Semantic index in {index_dir} has an incompatible format; rebuild it")
+            return False
+        count = meta["count"]
+        self.vectors = np.memmap(index_dir / "vectors.f32", dtype=np.float32, mode="r",
+                                 shape=(count, EMBEDDING_DIM)) if count else np.zeros((0, EMBEDDING_DIM), np.float32)
+        self.idf = np.fromfile(index_dir / "idf.f32", dtype=np.float32)
+        self.rows = meta["rows"]
+        self.versions = meta["versions"]
+        return True
+
+    def search_many(self, queries: Sequence[str], version: str = "ESV", limit: int = 10) -> List[List[Dict[str, Any]]]:
+        """Top-k verses for each query, computed as one matrix product"""
+        span = self.versions.get(version.strip().upper())
+        if not self.loaded or span is None or not queries:
+            return [[] for _ in queries]
+        start, end = span
+        matrix = self.vectors[start:end]
+        scores = embed_texts(queries, self.idf) @ matrix.T
+        k = min(limit, end - start)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        results = []
+        for q, candidates in enumerate(top):
+            ranked = candidates[np.argsort(-scores[q, candidates])]
+            hits = []
+            for column in ranked:
+                score = float(scores[q, column])
+                if score <= 0:
+                    break
+                book, chapter, verse, text = self.rows[start + column]
+                hits.append({
+                    "text": text,
+                    "reference": f"{book} {chapter}:{verse}",
+                    "book": book,
+                    "chapter": chapter,
+                    "verse": verse,
+                    "score": round(score, 4),
+                })
+            results.append(hits)
+        return results
+
+    def search(self, query: str, version: str = "ESV", limit: int = 10) -> List[Dict[str, Any]]:
+        return self.search_many([query], version, limit)[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "verses": len(self.rows),
+            "versions": {version: end - start for version, (start, end) in self.versions.items()},
+        }
+
+
+semantic_index = SemanticIndex()
+
+
+async def _load_chapters() -> List[Dict[str, Any]]:
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        collection = client[os.environ['DB_NAME']].bible_chapters
+        return await collection.find(
+            {}, {"_id": 0, "book": 1, "chapter": 1, "version": 1, "verses": 1}
+        ).to_list(None)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print(__doc__)
+        sys.exit(1)
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else SEMANTIC_INDEX_DIR
+    count = build_index(asyncio.run(_load_chapters()), target)
+    print(f"✓ Embedded {count} verses into {target}")
@@ -1,15 +1,20 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Body
+from fastapi import FastAPI, APIRouter, HTTPException, Body, Header, Query
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Literal, Mapping, Optional, Dict, Any, Sequence, Tuple
 import uuid
+from functools import partial
+import json
 from datetime import datetime
 
 # Import our services and data
@@ -17,17 +22,24 @@ from claude_service import (
     generate_home_dashboard,
     generate_devotional,
     get_bible_chapter,
+    stream_bible_chapter,
     get_chapter_context,
+    context_cache,
     generate_prayer_prompts,
-    generate_prayer
+    generate_prayer,
+    llm_flights,
+    llm_pool,
+    devotional_pool,
+    prayer_pool,
+    prayer_prompt_pool
 )
-from bible_versions_data import (
+from llm_pool import LLMOverloaded
+from catalog import (
+    get_catalog_fields,
     get_all_versions,
     get_versions_by_language,
     get_version_by_id,
-    get_available_languages
-)
-from fonts_colors_data import (
+    get_available_languages,
     get_all_fonts,
     get_fonts_by_category,
     get_font_by_id,
@@ -35,11 +47,21 @@ from fonts_colors_data import (
     get_colors_by_category,
     get_color_by_id
 )
+from cache import LRUCache, TTLCache
+from chapter_store import chapter_store
+from dashboard_scheduler import DashboardScheduler, dashboard_date
+from fast_json import FastJSONResponse, PreparedJSON, dumps as fast_dumps
+from highlight_rollups import RollupDeltas, apply_safely as apply_rollups, get_heatmap
+from invalidation import invalidation_bus
+from migrations import run_migrations
+from pagination import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, clamp_limit, decode_cursor, encode_cursor, fetch_page, keyset_filter
+from search_index import search_index
+from semantic_index import semantic_index
+from write_behind import WriteBehindBuffer
+from song_index import autocomplete, get_artist_songs, search_songs
 from worship_music_data import (
     get_all_artists,
-    get_all_songs,
-    search_songs,
-    get_artist_songs
+    get_all_songs
 )
 from models import (
     BibleVerse,
@@ -60,9 +82,209 @@ load_dotenv(ROOT_DIR / '.env')
 mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
+chapter_store.attach(db.bible_chapters)
+chapter_store.add_listener(search_index.add_chapter)
+
+# Daily dashboard pre-generation (one generating worker per day via a Mongo lease)
+DASHBOARD_PREGENERATE = os.environ.get('DASHBOARD_PREGENERATE', '1') == '1'
+# How long a request waits for a missing dashboard before serving the fallback;
+# generation carries on in the background
+DASHBOARD_WAIT_TIMEOUT = float(os.environ.get('DASHBOARD_WAIT_TIMEOUT', '3'))
+dashboard_scheduler = DashboardScheduler(lambda: generate_home_dashboard(raise_on_error=True))
+dashboard_scheduler.attach(db.cached_dashboards)
+
+# Content pool buckets kept warm from startup ("" is the untopical devotional)
+CONTENT_POOL_PREWARM = os.environ.get('CONTENT_POOL_PREWARM', '1') == '1'
+PREWARM_DEVOTIONAL_TOPICS = [""] + [
+    t.strip().lower() for t in os.environ.get('PREWARM_DEVOTIONAL_TOPICS', '').split(',') if t.strip()
+]
+PREWARM_PRAYER_TYPES = [
+    t.strip().lower()
+    for t in os.environ.get('PREWARM_PRAYER_TYPES', 'morning,evening,thanksgiving,confession,intercession').split(',')
+    if t.strip()
+]
+
+# Static catalog responses, serialized and hashed once per worker and
+# revalidated by clients with If-None-Match
+CATALOG_MAX_AGE = int(os.environ.get('CATALOG_MAX_AGE', '86400'))
+CATALOG_LISTS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "bible/versions": lambda: {"versions": get_all_versions()},
+    "bible/languages": lambda: {"languages": get_available_languages()},
+    "fonts": lambda: {"fonts": get_all_fonts()},
+    "colors": lambda: {"colors": get_all_colors()},
+}
+catalog_responses: Dict[str, PreparedJSON] = {}
+# Sparse fieldsets and pages (`fields=`, `limit`, `offset`) are prepared the
+# same way, one entry per combination, in a bounded LRU
+CATALOG_PAGE_MAX = 1000
+projected_responses = LRUCache(max_entries=int(os.environ.get('CATALOG_PROJECTION_CACHE_SIZE', '512')))
+WORSHIP_SONG_FIELDS = tuple(dict.fromkeys(field for song in get_all_songs() for field in song))
+WORSHIP_ARTIST_FIELDS = tuple(dict.fromkeys(field for artist in get_all_artists() for field in artist))
+
+
+def prepare_catalog_responses() -> None:
+    """(Re)build the prepared catalog lists; call again whenever the catalog changes"""
+    catalog_responses.clear()
+    projected_responses.clear()
+    for key, build in CATALOG_LISTS.items():
+        catalog_responses[key] = PreparedJSON(build(), CATALOG_MAX_AGE)
+
+
+def _catalog_response(key: str, build: Callable[[], Any], if_none_match: Optional[str]) -> Response:
+    projected = "?" in key
+    prepared = projected_responses.get(key) if projected else catalog_responses.get(key)
+    if prepared is None:
+        prepared = PreparedJSON(build(), CATALOG_MAX_AGE)
+        if projected:
+            projected_responses.set(key, prepared)
+        else:
+            catalog_responses[key] = prepared
+    return prepared.response(if_none_match)
+
+
+def _select_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated `fields=` list into catalog order (None keeps every field)"""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in allowed if name in requested)
+
+
+def _page_limit(limit: Optional[int], default: int = PAGE_SIZE_DEFAULT, maximum: int = PAGE_SIZE_MAX) -> int:
+    """Requested page size capped at maximum; 400 below 1"""
+    try:
+        return clamp_limit(limit, default, maximum)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _project(record: Mapping, selected: Optional[Tuple[str, ...]]) -> Mapping:
+    return record if selected is None else {name: record[name] for name in selected if name in record}
+
+
+def _view_key(key: str, selected: Optional[Tuple[str, ...]], limit: Optional[int] = None, offset: int = 0) -> str:
+    if selected is None and limit is None and not offset:
+        return key
+    return f"{key}?fields={','.join(selected or ())}&limit={limit}&offset={offset}"
+
+
+def _catalog_list(key: str, list_name: str, records: Sequence[Mapping], allowed: Sequence[str],
+                  if_none_match: Optional[str], fields: Optional[str] = None, limit: Optional[int] = None,
+                  offset: int = 0, extra: Optional[Dict[str, Any]] = None):
+    """A prepared catalog list, projected to `fields` and paged by limit/offset.
+
+    Paged responses also carry total, offset and limit.
+    """
+    selected = _select_fields(fields, allowed)
+    offset = max(0, offset)
+    if limit is not None:
+        limit = _page_limit(limit, maximum=CATALOG_PAGE_MAX)
+
+    def build() -> Dict[str, Any]:
+        page = records[offset:] if limit is None else records[offset:offset + limit]
+        content = dict(extra or {})
+        content[list_name] = [_project(record, selected) for record in page]
+        if limit is not None or offset:
+            content.update(total=len(records), offset=offset, limit=limit)
+        return content
+
+    if not records:
+        # Only known categories, languages and artists are prepared, so
+        # arbitrary paths cannot grow the caches
+        return build()
+    return _catalog_response(_view_key(key, selected, limit, offset), build, if_none_match)
+
+
+# Per-worker settings cache; writes go through it, other workers see them within the TTL
+settings_cache = TTLCache(
+    max_entries=int(os.environ.get('SETTINGS_CACHE_SIZE', '10000')),
+    ttl_seconds=float(os.environ.get('SETTINGS_CACHE_TTL', '60'))
+)
+
+# Opt-in batching of highlight and status-check inserts (see write_behind.py);
+# WRITE_BEHIND_ACK=0 answers before the batch is written
+WRITE_BEHIND = os.environ.get('WRITE_BEHIND', '0') == '1'
+WRITE_BEHIND_ACK = os.environ.get('WRITE_BEHIND_ACK', '1') == '1'
+
+
+async def _roll_up_highlights(docs: List[Dict[str, Any]]) -> None:
+    # One rollup write per batch, counting only highlights that were inserted
+    deltas = RollupDeltas()
+    for doc in docs:
+        deltas.add(doc)
+    await apply_rollups(db.highlight_rollups, deltas)
+
+
+highlight_writes = WriteBehindBuffer(db.highlights, on_written=_roll_up_highlights)
+status_writes = WriteBehindBuffer(db.status_checks)
+
+
+async def _insert(collection, buffer: WriteBehindBuffer, doc: Dict[str, Any]) -> None:
+    if WRITE_BEHIND:
+        await buffer.insert(doc, ack=WRITE_BEHIND_ACK)
+    else:
+        await collection.insert_one(doc)
+
+
+# Keep the per-worker caches coherent with writes made by other workers
+def _on_settings_change(doc: Optional[Dict[str, Any]]) -> None:
+    if doc and doc.get("user_id"):
+        settings_cache.pop(doc["user_id"])
+    else:
+        settings_cache.clear()
+
+
+def _on_dashboard_change(doc: Optional[Dict[str, Any]]) -> None:
+    if doc is None:
+        dashboard_scheduler.forget()
+    elif doc.get("date"):
+        dashboard_scheduler.forget(doc["date"])
+    # Lease documents carry no date and never reach the memo
+
+
+def _on_chapter_change(doc: Optional[Dict[str, Any]]) -> None:
+    if doc and doc.get("book") and doc.get("chapter") is not None and doc.get("version"):
+        chapter_store.evict(doc["book"], doc["chapter"], doc["version"])
+    else:
+        chapter_store.clear()
+        if invalidation_bus.mode == "change_streams":
+            # The stream may have skipped inserts; catch the search index up
+            _keep_running(asyncio.create_task(search_index.catch_up(db.bible_chapters)))
+
+
+def _on_chapter_insert(doc: Optional[Dict[str, Any]]) -> None:
+    # A new chapter cannot be stale in any worker's cache, but other
+    # workers' search indexes have not seen it yet
+    if doc:
+        search_index.add_stored_chapter(doc)
+
+
+invalidation_bus.attach(db)
+invalidation_bus.subscribe("settings", _on_settings_change)
+invalidation_bus.subscribe("cached_dashboards", _on_dashboard_change)
+invalidation_bus.subscribe(
+    "bible_chapters", _on_chapter_change, on_insert=_on_chapter_insert, fields=("book", "chapter", "version")
+)
+
+# Per-part deadlines (seconds) for /api/bible/read
+BIBLE_VERSES_TIMEOUT = float(os.environ.get('BIBLE_VERSES_TIMEOUT', '60'))
+BIBLE_CONTEXT_TIMEOUT = float(os.environ.get('BIBLE_CONTEXT_TIMEOUT', '10'))
+
+# Strong references to fire-and-forget tasks so they are not garbage collected
+_background_tasks = set()
+
+
+def _keep_running(task: asyncio.Task) -> asyncio.Task:
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 
 # Create the main app without a prefix
-app = FastAPI(title="Ayumi API - Walking with God", version="2.0.0")
+app = FastAPI(title="Ayumi API - Walking with God", version="2.0.0", default_response_class=FastJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -101,6 +323,20 @@ class UserHighlight(BaseModel):
     text: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class HighlightOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = None
+    book: Optional[str] = None
+    chapter: Optional[int] = None
+    verse: Optional[int] = None
+    color_id: Optional[str] = None
+    text: Optional[str] = None
+
+class HighlightBatchRequest(BaseModel):
+    user_id: str
+    operations: List[HighlightOperation]
+    ordered: bool = False
+
 
 # ==========================
 # CORE ENDPOINTS
@@ -122,39 +358,59 @@ async def root():
     }
 
 
+@api_router.get("/metrics")
+async def get_metrics():
+    """Get in-process cache and service counters"""
+    return {
+        "chapter_store": chapter_store.stats(),
+        "llm_flights": llm_flights.stats(),
+        "context_cache": context_cache.stats(),
+        "llm_pool": llm_pool.stats(),
+        "settings_cache": settings_cache.stats(),
+        "catalog_projections": projected_responses.stats(),
+        "invalidation": invalidation_bus.stats(),
+        "write_behind": {
+            "enabled": WRITE_BEHIND,
+            "highlights": highlight_writes.stats(),
+            "status_checks": status_writes.stats()
+        },
+        "search_index": search_index.stats(),
+        "semantic_index": semantic_index.stats(),
+        "content_pools": {
+            "devotional": devotional_pool.stats(),
+            "prayer": prayer_pool.stats(),
+            "prayer_prompts": prayer_prompt_pool.stats()
+        },
+        "dashboard_scheduler": dashboard_scheduler.stats()
+    }
+
+
 # ==========================
 # DASHBOARD ENDPOINTS
 # ==========================
 
 @api_router.get("/dashboard")
 async def get_dashboard():
-    """Get comprehensive daily dashboard content - returns fallback instantly, Claude-generated when available"""
-    import asyncio
-    from datetime import datetime
-    
-    # Check if we have a cached Claude-generated dashboard in MongoDB
-    cached = await db.cached_dashboards.find_one({"date": datetime.now().strftime("%Y-%m-%d")})
-    if cached:
-        cached.pop('_id', None)
-        return cached.get('data', get_fallback_dashboard())
-    
-    # Return fallback instantly 
-    fallback = get_fallback_dashboard()
-    
-    # Schedule Claude generation in background
-    async def generate_and_cache():
-        try:
-            dashboard = await generate_home_dashboard()
-            await db.cached_dashboards.update_one(
-                {"date": datetime.now().strftime("%Y-%m-%d")},
-                {"$set": {"date": datetime.now().strftime("%Y-%m-%d"), "data": dashboard}},
-                upsert=True
-            )
-        except Exception as e:
-            logging.error(f"Background dashboard generation error: {e}")
-    
-    asyncio.create_task(generate_and_cache())
-    return fallback
+    """Get comprehensive daily dashboard content - pre-generated by the scheduler, fallback only if generation fails"""
+    date = dashboard_date()
+    dashboard = await dashboard_scheduler.get(date)
+    if dashboard is not None:
+        return dashboard
+
+    if dashboard_scheduler.cooling_down(date):
+        # Generation just failed everywhere; don't make this request wait on another attempt
+        return get_fallback_dashboard()
+
+    # Not pre-generated (e.g. first deploy): generate now under the shared lease
+    try:
+        dashboard = await asyncio.wait_for(dashboard_scheduler.ensure(date), DASHBOARD_WAIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        logging.error(f"Dashboard generation for {date} is taking longer than {DASHBOARD_WAIT_TIMEOUT}s")
+        dashboard = None
+    except Exception as e:
+        logging.error(f"Dashboard generation error: {e}")
+        dashboard = None
+    return dashboard if dashboard is not None else get_fallback_dashboard()
 
 
 def get_fallback_dashboard():
@@ -228,42 +484,137 @@ def get_fallback_dashboard():
 # ==========================
 
 @api_router.get("/bible/versions")
-async def get_bible_versions():
+async def get_bible_versions(fields: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                             if_none_match: Optional[str] = Header(None)):
     """Get all available Bible versions"""
-    return {"versions": get_all_versions()}
+    return _catalog_list("bible/versions", "versions", get_all_versions(), get_catalog_fields("versions"),
+                         if_none_match, fields, limit, offset)
 
 
 @api_router.get("/bible/versions/language/{language_code}")
-async def get_versions_for_language(language_code: str):
+async def get_versions_for_language(language_code: str, fields: Optional[str] = None, limit: Optional[int] = None,
+                                    offset: int = 0, if_none_match: Optional[str] = Header(None)):
     """Get Bible versions for specific language"""
-    versions = get_versions_by_language(language_code)
-    return {"language_code": language_code, "versions": versions}
+    return _catalog_list(f"bible/versions/language/{language_code}", "versions",
+                         get_versions_by_language(language_code), get_catalog_fields("versions"),
+                         if_none_match, fields, limit, offset, extra={"language_code": language_code})
 
 
 @api_router.get("/bible/languages")
-async def get_languages():
+async def get_languages(if_none_match: Optional[str] = Header(None)):
     """Get all available languages"""
-    return {"languages": get_available_languages()}
+    return _catalog_response("bible/languages", CATALOG_LISTS["bible/languages"], if_none_match)
+
+
+# Declared before /bible/{book}/{chapter}, which would otherwise capture it
+@api_router.get("/bible/search/{query}")
+async def search_bible(query: str, version: str = "ESV", limit: int = 10, llm_fallback: bool = True, mode: str = "text"):
+    """Search for Bible content - local index first (mode=semantic for meaning-based
+    matching), LLM only when the index has no hits"""
+    limit = max(1, min(limit, 50))
+    if mode == "semantic" and semantic_index.loaded:
+        results = semantic_index.search(query, version, limit)
+        if results:
+            return {"query": query, "source": "semantic", "results": results}
+    results = search_index.search(query, version, limit)
+    if results:
+        return {"query": query, "source": "index", "results": results}
+    if not llm_fallback:
+        return {"query": query, "source": "index", "results": []}
+
+    try:
+        from claude_service import parse_json_response
+
+        prompt = f"""Find 5 Bible verses related to "{query}". Return JSON array:
+[{{"text":"verse text","reference":"Book Chapter:Verse","relevance":"why relevant"}}]
+Return ONLY the JSON array."""
+
+        response = await llm_pool.send(f"search-{query[:20]}", prompt)
+        results = parse_json_response(response)
+        return {"query": query, "source": "llm", "results": results}
+    except Exception as e:
+        logging.error(f"Bible search error: {e}")
+        # Fallback results
+        return {"query": query, "source": "fallback", "results": [
+            {"text": "For God so loved the world...", "reference": "John 3:16", "relevance": "Universal love"},
+            {"text": "I can do all things through Christ...", "reference": "Philippians 4:13", "relevance": "Strength in Christ"},
+        ]}
 
 
 @api_router.post("/bible/read")
 async def read_bible_chapter(request: BibleReadRequest):
-    """Read a complete Bible chapter"""
+    """Read a complete Bible chapter; verses and context are fetched concurrently"""
+    loop = asyncio.get_running_loop()
+    context_deadline = loop.time() + BIBLE_CONTEXT_TIMEOUT
+    verses_task = asyncio.create_task(get_bible_chapter(request.book, request.chapter, request.version))
+    context_task = asyncio.create_task(get_chapter_context(request.book, request.chapter))
+    _keep_running(context_task)
+
     try:
-        verses = await get_bible_chapter(request.book, request.chapter, request.version)
-        context = await get_chapter_context(request.book, request.chapter)
-        
-        return {
-            "book": request.book,
-            "chapter": request.chapter,
-            "version": request.version,
-            "verses": verses,
-            "context": context
-        }
+        verses = await asyncio.wait_for(verses_task, BIBLE_VERSES_TIMEOUT)
+    except asyncio.TimeoutError:
+        logging.error(f"Bible read timed out: {request.book} {request.chapter} ({request.version})")
+        raise HTTPException(status_code=504, detail="Timed out reading chapter")
+    except LLMOverloaded:
+        raise
     except Exception as e:
         logging.error(f"Bible read error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    # Context gets whatever is left of its own deadline; if it misses, the
+    # call keeps running and GET /api/bible/context/{book}/{chapter} joins it
+    await asyncio.wait({context_task}, timeout=max(0.0, context_deadline - loop.time()))
+    if context_task.done() and not context_task.cancelled() and context_task.exception() is None:
+        context = context_task.result()
+        context_status = "ready" if context is not None else "unavailable"
+    else:
+        context = None
+        context_status = "pending"
+
+    return {
+        "book": request.book,
+        "chapter": request.chapter,
+        "version": request.version,
+        "verses": verses,
+        "context": context,
+        "context_status": context_status
+    }
+
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@api_router.get("/bible/stream/{book}/{chapter}")
+async def stream_chapter(book: str, chapter: int, version: str = "ESV"):
+    """Stream a Bible chapter as server-sent events, one "verse" event per verse"""
+    async def events():
+        count = 0
+        try:
+            async for verse in stream_bible_chapter(book, chapter, version):
+                count += 1
+                yield _sse_event("verse", verse)
+        except Exception as e:
+            logging.error(f"Bible stream error: {e}")
+            yield _sse_event("error", {"detail": str(e), "count": count})
+            return
+        yield _sse_event("done", {"book": book, "chapter": chapter, "version": version, "count": count})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@api_router.get("/bible/context/{book}/{chapter}")
+async def get_context(book: str, chapter: int):
+    """Get chapter context (used to complete a read whose context was pending)"""
+    context = await get_chapter_context(book, chapter)
+    if context is None:
+        raise HTTPException(status_code=503, detail="Context unavailable")
+    return {"book": book, "chapter": chapter, "context": context}
+
 
 @api_router.get("/bible/{book}/{chapter}")
 async def get_chapter(book: str, chapter: int, version: str = "ESV"):
@@ -271,6 +622,8 @@ async def get_chapter(book: str, chapter: int, version: str = "ESV"):
     try:
         verses = await get_bible_chapter(book, chapter, version)
         return {"book": book, "chapter": chapter, "version": version, "verses": verses}
+    except LLMOverloaded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -297,63 +650,217 @@ async def create_highlight(highlight: HighlightRequest):
             text=highlight.text
         )
         
-        await db.highlights.insert_one(highlight_doc.dict())
+        await _insert(db.highlights, highlight_writes, highlight_doc.dict())
+        if not WRITE_BEHIND:
+            # With write-behind the buffer rolls up each batch it writes
+            deltas = RollupDeltas()
+            deltas.add(highlight_doc.dict())
+            await apply_rollups(db.highlight_rollups, deltas)
         return highlight_doc
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Keyset order for highlight pages (backed by the user_created / user_chapter_created indexes)
+HIGHLIGHT_SORT = [("created_at", 1), ("id", 1)]
+
+
 @api_router.get("/highlights/{user_id}")
-async def get_user_highlights(user_id: str):
-    """Get all highlights for a user"""
-    highlights = await db.highlights.find({"user_id": user_id}).to_list(1000)
-    return {"highlights": highlights}
+async def get_user_highlights(user_id: str, limit: int = 200, cursor: Optional[str] = None):
+    """Get a user's highlights, oldest first; pass next_cursor back for the next page"""
+    try:
+        highlights, next_cursor = await fetch_page(
+            db.highlights, {"user_id": user_id}, HIGHLIGHT_SORT, _page_limit(limit, 200), cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"highlights": highlights, "next_cursor": next_cursor})
+
+
+@api_router.get("/highlights/{user_id}/export")
+async def export_user_highlights(user_id: str):
+    """Stream every highlight for a user as NDJSON"""
+    async def lines():
+        cursor = db.highlights.find({"user_id": user_id}, {"_id": 0}).sort(HIGHLIGHT_SORT).batch_size(500)
+        async for doc in cursor:
+            yield fast_dumps(doc) + b"\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="highlights-{user_id}.ndjson"'}
+    )
 
 
 @api_router.get("/highlights/{user_id}/{book}/{chapter}")
-async def get_chapter_highlights(user_id: str, book: str, chapter: int):
+async def get_chapter_highlights(user_id: str, book: str, chapter: int, limit: int = 500, cursor: Optional[str] = None):
     """Get highlights for a specific chapter"""
-    highlights = await db.highlights.find({
-        "user_id": user_id,
-        "book": book,
-        "chapter": chapter
-    }).to_list(100)
-    return {"highlights": highlights}
+    try:
+        highlights, next_cursor = await fetch_page(
+            db.highlights, {"user_id": user_id, "book": book, "chapter": chapter},
+            HIGHLIGHT_SORT, _page_limit(limit, 500), cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"highlights": highlights, "next_cursor": next_cursor})
+
+
+HIGHLIGHT_BATCH_MAX = 500
+
+
+@api_router.post("/highlights/batch")
+async def batch_highlights(batch: HighlightBatchRequest):
+    """Create, update and delete many highlights in one bulk write.
+
+    Returns one result per operation, in request order. With ordered=true the
+    write stops at the first failing operation.
+    """
+    if len(batch.operations) > HIGHLIGHT_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {HIGHLIGHT_BATCH_MAX} operations per batch")
+
+    colors = {}
+    for color_id in {op.color_id for op in batch.operations if op.color_id}:
+        color = get_color_by_id(color_id)
+        if color:
+            colors[color_id] = color["hex_color"]
+
+    # One lookup tells which updates/deletes target an existing highlight
+    target_ids = [op.id for op in batch.operations if op.op != "create" and op.id]
+    existing: Dict[str, Dict[str, Any]] = {}
+    if target_ids:
+        async for doc in db.highlights.find(
+            {"user_id": batch.user_id, "id": {"$in": target_ids}},
+            {"_id": 0, "id": 1, "user_id": 1, "book": 1, "chapter": 1, "color_id": 1}
+        ):
+            existing[doc["id"]] = doc
+
+    results: List[Dict[str, Any]] = []
+    requests = []
+    request_items = []  # index in results for each bulk request
+    rollup_changes = []  # rollup change for each bulk request, applied if it succeeds
+    for index, op in enumerate(batch.operations):
+        result: Dict[str, Any] = {"index": index, "op": op.op, "id": op.id}
+        results.append(result)
+        if op.color_id and op.color_id not in colors:
+            result.update(status="invalid", detail="Color not found")
+            continue
+        if op.op == "create":
+            if not op.book or op.chapter is None or op.verse is None or not op.color_id:
+                result.update(status="invalid", detail="book, chapter, verse and color_id are required")
+                continue
+            highlight = UserHighlight(
+                user_id=batch.user_id,
+                book=op.book,
+                chapter=op.chapter,
+                verse=op.verse,
+                color_id=op.color_id,
+                color_hex=colors[op.color_id],
+                text=op.text
+            )
+            requests.append(InsertOne(highlight.dict()))
+            rollup_changes.append(partial(RollupDeltas.add, doc=highlight.dict()))
+            result.update(id=highlight.id, status="created", highlight=highlight.dict())
+        elif not op.id:
+            result.update(status="invalid", detail="id is required")
+            continue
+        elif op.id not in existing:
+            result.update(status="not_found")
+            continue
+        elif op.op == "update":
+            changes = {"text": op.text} if op.text is not None else {}
+            if op.color_id:
+                changes.update(color_id=op.color_id, color_hex=colors[op.color_id])
+            if not changes:
+                result.update(status="invalid", detail="Nothing to update")
+                continue
+            requests.append(UpdateOne({"id": op.id, "user_id": batch.user_id}, {"$set": changes}))
+            doc = existing[op.id]
+            if op.color_id:
+                existing[op.id] = dict(doc, color_id=op.color_id)
+            rollup_changes.append(partial(RollupDeltas.recolor, doc=doc, color_id=op.color_id) if op.color_id else None)
+            result.update(status="updated")
+        else:
+            requests.append(DeleteOne({"id": op.id, "user_id": batch.user_id}))
+            rollup_changes.append(partial(RollupDeltas.remove, doc=existing.pop(op.id)))
+            result.update(status="deleted")
+        request_items.append(index)
+
+    if requests:
+        applied = set(range(len(requests)))
+        try:
+            await db.highlights.bulk_write(requests, ordered=batch.ordered)
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+            for position, index in enumerate(request_items):
+                if position in failed:
+                    results[index].update(status="error", detail=failed[position])
+                    results[index].pop("highlight", None)
+                    applied.discard(position)
+                elif batch.ordered and position > min(failed, default=len(request_items)):
+                    results[index].update(status="skipped")
+                    results[index].pop("highlight", None)
+                    applied.discard(position)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+        deltas = RollupDeltas()
+        for position in sorted(applied):
+            if rollup_changes[position] is not None:
+                rollup_changes[position](deltas)
+        await apply_rollups(db.highlight_rollups, deltas)
+
+    return {"results": results}
 
 
 @api_router.delete("/highlights/{highlight_id}")
 async def delete_highlight(highlight_id: str):
     """Delete a highlight"""
-    result = await db.highlights.delete_one({"id": highlight_id})
-    if result.deleted_count == 0:
+    deleted = await db.highlights.find_one_and_delete(
+        {"id": highlight_id}, {"_id": 0, "user_id": 1, "book": 1, "chapter": 1, "color_id": 1}
+    )
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Highlight not found")
+    deltas = RollupDeltas()
+    deltas.remove(deleted)
+    await apply_rollups(db.highlight_rollups, deltas)
     return {"message": "Highlight deleted"}
 
 
+@api_router.get("/highlights/{user_id}/heatmap")
+async def get_highlight_heatmap(user_id: str):
+    """Highlight counts per book, chapter and color, read from the rollups"""
+    return FastJSONResponse(await get_heatmap(db.highlight_rollups, user_id))
+
+
 # ==========================
 # FONTS ENDPOINTS
 # ==========================
 
 @api_router.get("/fonts")
-async def get_fonts():
+async def get_fonts(fields: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                    if_none_match: Optional[str] = Header(None)):
     """Get all available fonts"""
-    return {"fonts": get_all_fonts()}
+    return _catalog_list("fonts", "fonts", get_all_fonts(), get_catalog_fields("fonts"),
+                         if_none_match, fields, limit, offset)
 
 
 @api_router.get("/fonts/category/{category}")
-async def get_fonts_by_cat(category: str):
+async def get_fonts_by_cat(category: str, fields: Optional[str] = None, limit: Optional[int] = None,
+                           offset: int = 0, if_none_match: Optional[str] = Header(None)):
     """Get fonts by category"""
-    fonts = get_fonts_by_category(category)
-    return {"category": category, "fonts": fonts}
+    return _catalog_list(f"fonts/category/{category}", "fonts", get_fonts_by_category(category),
+                         get_catalog_fields("fonts"), if_none_match, fields, limit, offset,
+                         extra={"category": category})
 
 
 @api_router.get("/fonts/{font_id}")
-async def get_font(font_id: str):
+async def get_font(font_id: str, fields: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
     """Get specific font"""
     font = get_font_by_id(font_id)
     if not font:
         raise HTTPException(status_code=404, detail="Font not found")
-    return font
+    selected = _select_fields(fields, get_catalog_fields("fonts"))
+    return _catalog_response(_view_key(f"fonts/{font_id}", selected), lambda: _project(font, selected), if_none_match)
 
 
 # ==========================
@@ -361,25 +868,30 @@ async def get_font(font_id: str):
 # ==========================
 
 @api_router.get("/colors")
-async def get_colors():
+async def get_colors(fields: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                     if_none_match: Optional[str] = Header(None)):
     """Get all highlight colors"""
-    return {"colors": get_all_colors()}
+    return _catalog_list("colors", "colors", get_all_colors(), get_catalog_fields("colors"),
+                         if_none_match, fields, limit, offset)
 
 
 @api_router.get("/colors/category/{category}")
-async def get_colors_by_cat(category: str):
+async def get_colors_by_cat(category: str, fields: Optional[str] = None, limit: Optional[int] = None,
+                            offset: int = 0, if_none_match: Optional[str] = Header(None)):
     """Get colors by category"""
-    colors = get_colors_by_category(category)
-    return {"category": category, "colors": colors}
+    return _catalog_list(f"colors/category/{category}", "colors", get_colors_by_category(category),
+                         get_catalog_fields("colors"), if_none_match, fields, limit, offset,
+                         extra={"category": category})
 
 
 @api_router.get("/colors/{color_id}")
-async def get_color(color_id: str):
+async def get_color(color_id: str, fields: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
     """Get specific color"""
     color = get_color_by_id(color_id)
     if not color:
         raise HTTPException(status_code=404, detail="Color not found")
-    return color
+    selected = _select_fields(fields, get_catalog_fields("colors"))
+    return _catalog_response(_view_key(f"colors/{color_id}", selected), lambda: _project(color, selected), if_none_match)
 
 
 # ==========================
@@ -424,26 +936,51 @@ async def create_prayer(prayer_type: str = Body(..., embed=True)):
 # USER SETTINGS ENDPOINTS
 # ==========================
 
+async def _load_settings(user_id: str) -> Dict[str, Any]:
+    """Fetch a user's settings, creating the defaults atomically on first use"""
+    defaults = UserSettings(user_id=user_id).dict()
+    defaults.pop("user_id")
+    try:
+        return await db.settings.find_one_and_update(
+            {"user_id": user_id},
+            {"$setOnInsert": defaults},
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # A concurrent first load inserted the document between our match and insert
+        return await db.settings.find_one({"user_id": user_id}, {"_id": 0})
+
+
 @api_router.get("/settings/{user_id}")
 async def get_settings(user_id: str):
     """Get user settings"""
-    settings = await db.settings.find_one({"user_id": user_id})
-    if not settings:
-        default_settings = UserSettings(user_id=user_id)
-        await db.settings.insert_one(default_settings.dict())
-        return default_settings
-    return settings
+    settings = settings_cache.get(user_id)
+    if settings is None:
+        token = settings_cache.token()
+        settings = await _load_settings(user_id)
+        settings_cache.set(user_id, settings, token)
+    return FastJSONResponse(settings)
 
 
 @api_router.put("/settings/{user_id}")
 async def update_settings(user_id: str, settings: Dict[str, Any] = Body(...)):
     """Update user settings"""
     settings["user_id"] = user_id
-    await db.settings.update_one(
+    defaults = {k: v for k, v in UserSettings(user_id=user_id).dict().items() if k not in settings}
+    update = {"$set": settings}
+    if defaults:
+        update["$setOnInsert"] = defaults
+    stored = await db.settings.find_one_and_update(
         {"user_id": user_id},
-        {"$set": settings},
-        upsert=True
+        update,
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
     )
+    settings_cache.set(user_id, stored)
+    await invalidation_bus.publish("settings", {"user_id": user_id})
     return {"message": "Settings updated", "settings": settings}
 
 
@@ -452,29 +989,43 @@ async def update_settings(user_id: str, settings: Dict[str, Any] = Body(...)):
 # ==========================
 
 @api_router.get("/worship/artists")
-async def get_worship_artists():
+async def get_worship_artists(fields: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                              if_none_match: Optional[str] = Header(None)):
     """Get all worship artists"""
-    return {"artists": get_all_artists()}
+    return _catalog_list("worship/artists", "artists", get_all_artists(), WORSHIP_ARTIST_FIELDS,
+                         if_none_match, fields, limit, offset)
 
 
 @api_router.get("/worship/songs")
-async def get_worship_songs():
+async def get_worship_songs(fields: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                            if_none_match: Optional[str] = Header(None)):
     """Get all worship songs"""
-    return {"songs": get_all_songs()}
+    return _catalog_list("worship/songs", "songs", get_all_songs(), WORSHIP_SONG_FIELDS,
+                         if_none_match, fields, limit, offset)
 
 
 @api_router.get("/worship/search/{query}")
-async def search_worship_songs(query: str):
-    """Search worship songs"""
-    results = search_songs(query)
-    return {"query": query, "results": results}
+async def search_worship_songs(query: str, limit: int = 50, offset: int = 0, fields: Optional[str] = None):
+    """Search worship songs, best match first (tolerates typos)"""
+    selected = _select_fields(fields, WORSHIP_SONG_FIELDS)
+    offset = max(0, offset)
+    results = search_songs(query, limit=offset + _page_limit(limit, 50, 200))[offset:]
+    return {"query": query, "results": [_project(song, selected) for song in results]}
+
+
+@api_router.get("/worship/autocomplete")
+async def autocomplete_worship(q: str = "", limit: int = 10):
+    """Song and artist suggestions as the user types"""
+    return {"query": q, "suggestions": autocomplete(q, limit=_page_limit(limit, 10, 50))}
 
 
 @api_router.get("/worship/artist/{artist_id}/songs")
-async def get_songs_by_artist(artist_id: str):
+async def get_songs_by_artist(artist_id: str, fields: Optional[str] = None, limit: Optional[int] = None,
+                              offset: int = 0, if_none_match: Optional[str] = Header(None)):
     """Get songs by specific artist"""
-    songs = get_artist_songs(artist_id)
-    return {"artist_id": artist_id, "songs": songs}
+    return _catalog_list(f"worship/artist/{artist_id}/songs", "songs", get_artist_songs(artist_id),
+                         WORSHIP_SONG_FIELDS, if_none_match, fields, limit, offset,
+                         extra={"artist_id": artist_id})
 
 
 # ==========================
@@ -483,6 +1034,7 @@ async def get_songs_by_artist(artist_id: str):
 
 class JournalEntryCreate(BaseModel):
     id: str
+    user_id: str
     date: str
     title: str
     text: str
@@ -491,64 +1043,94 @@ class JournalEntryCreate(BaseModel):
     mood: Optional[str] = None
 
 
-@api_router.get("/journal/entries")
-async def get_journal_entries():
-    """Get all journal entries"""
-    entries = await db.journal_entries.find().sort("date", -1).to_list(500)
-    for e in entries:
-        e.pop('_id', None)
-    return {"entries": entries}
+# Newest first; backed by the user_date index
+JOURNAL_SORT = [("date", -1), ("id", -1)]
+JOURNAL_SEARCH_MAX = 100
+
+
+@api_router.get("/journal/{user_id}/entries")
+async def get_journal_entries(user_id: str, limit: int = 50, cursor: Optional[str] = None):
+    """Get a user's journal entries, newest first; pass next_cursor back for older ones"""
+    try:
+        entries, next_cursor = await fetch_page(
+            db.journal_entries, {"user_id": user_id}, JOURNAL_SORT, _page_limit(limit, 50, 200), cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"entries": entries, "next_cursor": next_cursor})
+
+
+@api_router.get("/journal/{user_id}/search")
+async def search_journal(user_id: str, q: Optional[str] = None, tags: List[str] = Query([]),
+                         mood: Optional[str] = None, limit: int = 20):
+    """Search a user's journal by text (ranked by relevance), tags and mood.
+
+    Also returns tag and mood counts over everything that matched.
+    """
+    match: Dict[str, Any] = {"user_id": user_id}
+    if q and q.strip():
+        match["$text"] = {"$search": q}
+    if tags:
+        match["tags"] = {"$all": tags}
+    if mood:
+        match["mood"] = mood
+    ranked = "$text" in match
+    sort = {"score": -1, "date": -1, "id": -1} if ranked else {"date": -1, "id": -1}
+
+    pipeline: List[Dict[str, Any]] = [{"$match": match}]
+    if ranked:
+        pipeline.append({"$addFields": {"score": {"$meta": "textScore"}}})
+    pipeline.append({"$facet": {
+        "results": [{"$sort": sort}, {"$limit": _page_limit(limit, 20, JOURNAL_SEARCH_MAX)}, {"$project": {"_id": 0}}],
+        "tags": [
+            {"$unwind": "$tags"},
+            {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": 50}
+        ],
+        "moods": [
+            {"$match": {"mood": {"$ne": None}}},
+            {"$group": {"_id": "$mood", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}}
+        ],
+        "total": [{"$count": "count"}]
+    }})
+    try:
+        facets = (await db.journal_entries.aggregate(pipeline).to_list(1))[0]
+    except Exception as e:
+        logging.error(f"Journal search error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return FastJSONResponse({
+        "query": q,
+        "total": facets["total"][0]["count"] if facets["total"] else 0,
+        "results": facets["results"],
+        "facets": {
+            "tags": [{"value": f["_id"], "count": f["count"]} for f in facets["tags"]],
+            "moods": [{"value": f["_id"], "count": f["count"]} for f in facets["moods"]]
+        }
+    })
 
 
 @api_router.post("/journal/entries")
 async def save_journal_entry(entry: JournalEntryCreate):
     """Create or update a journal entry"""
     entry_dict = entry.dict()
+    # Ids are unique per user (user_entry_unique), so any user may reuse one
     await db.journal_entries.update_one(
-        {"id": entry.id},
+        {"id": entry.id, "user_id": entry.user_id},
         {"$set": entry_dict},
         upsert=True
     )
     return {"message": "Entry saved", "entry": entry_dict}
 
 
-@api_router.delete("/journal/entries/{entry_id}")
-async def delete_journal_entry(entry_id: str):
+@api_router.delete("/journal/{user_id}/entries/{entry_id}")
+async def delete_journal_entry(user_id: str, entry_id: str):
     """Delete a journal entry"""
-    result = await db.journal_entries.delete_one({"id": entry_id})
+    result = await db.journal_entries.delete_one({"id": entry_id, "user_id": user_id})
     return {"message": "Entry deleted", "deleted": result.deleted_count > 0}
 
 
-# ==========================
-# BIBLE SEARCH ENDPOINT
-# ==========================
-
-@api_router.get("/bible/search/{query}")
-async def search_bible(query: str):
-    """Search for Bible content"""
-    try:
-        from claude_service import get_chat_client
-        from emergentintegrations.llm.chat import UserMessage
-        import json
-
-        chat = get_chat_client(session_id=f"search-{query[:20]}")
-        prompt = f"""Find 5 Bible verses related to "{query}". Return JSON array:
-[{{"text":"verse text","reference":"Book Chapter:Verse","relevance":"why relevant"}}]
-Return ONLY the JSON array."""
-
-        message = UserMessage(text=prompt)
-        response = await chat.send_message(message)
-        results = json.loads(response)
-        return {"query": query, "results": results}
-    except Exception as e:
-        logging.error(f"Bible search error: {e}")
-        # Fallback results
-        return {"query": query, "results": [
-            {"text": "For God so loved the world...", "reference": "John 3:16", "relevance": "Universal love"},
-            {"text": "I can do all things through Christ...", "reference": "Philippians 4:13", "relevance": "Strength in Christ"},
-        ]}
-
-
 # ==========================
 # VERSE IMAGE DATA ENDPOINT
 # ==========================
@@ -578,13 +1160,53 @@ async def get_verse_backgrounds():
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
-    await db.status_checks.insert_one(status_obj.dict())
+    await _insert(db.status_checks, status_writes, status_obj.dict())
     return status_obj
 
-@api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+# Newest first; backed by the timestamp_id index. id breaks ties between
+# checks stored in the same millisecond
+STATUS_SORT = [("timestamp", -1), ("id", -1)]
+
+
+@api_router.get("/status")
+async def get_status_checks(limit: int = 100, cursor: Optional[str] = None):
+    """Status checks, newest first, streamed; pass next_cursor back for older ones.
+
+    Stored documents are trusted and sent without model validation.
+    """
+    limit = _page_limit(limit, 100)
+    query: Dict[str, Any] = {}
+    if cursor:
+        try:
+            query = keyset_filter(STATUS_SORT, decode_cursor(cursor, len(STATUS_SORT)))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    docs = db.status_checks.find(query, {"_id": 0}).sort(STATUS_SORT).limit(limit + 1)
+
+    async def body():
+        yield b'{"status_checks":['
+        last = None
+        count = 0
+        async for doc in docs:
+            if count == limit:
+                # One more than a page exists, so the page is not the last
+                yield b'],"next_cursor":' + fast_dumps(encode_cursor([last.get(f) for f, _ in STATUS_SORT])) + b"}"
+                return
+            yield fast_dumps(doc) if last is None else b"," + fast_dumps(doc)
+            last = doc
+            count += 1
+        yield b'],"next_cursor":null}'
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@app.exception_handler(LLMOverloaded)
+async def llm_overloaded_handler(request, exc: LLMOverloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The service is busy, please retry shortly"},
+        headers={"Retry-After": "5"}
+    )
 
 
 # Include the router in the main app
@@ -605,8 +1227,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+chapter_sync_task: Optional[asyncio.Task] = None
+
+
+async def _index_stored_chapters() -> None:
+    # Everything stored so far; later chapters from other workers arrive as
+    # change stream inserts, or by polling where there are no change streams
+    try:
+        await search_index.load_from(db.bible_chapters)
+    except Exception as e:
+        logger.error(f"Search index load error: {e}")
+    if invalidation_bus.mode != "change_streams":
+        await search_index.follow(db.bible_chapters)
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    prepare_catalog_responses()
+    try:
+        applied = await run_migrations(db)
+        if applied:
+            logger.info(f"Applied schema migrations {applied}")
+    except Exception as e:
+        logger.error(f"Schema migration error: {e}")
+    try:
+        await invalidation_bus.start()
+    except Exception as e:
+        logger.error(f"Cache invalidation start error: {e}")
+    global chapter_sync_task
+    chapter_sync_task = _keep_running(asyncio.create_task(_index_stored_chapters()))
+    if not semantic_index.load():
+        logger.info("No semantic index built yet; run `python semantic_index.py build`")
+    if DASHBOARD_PREGENERATE:
+        dashboard_scheduler.start()
+    if CONTENT_POOL_PREWARM:
+        devotional_pool.warm(PREWARM_DEVOTIONAL_TOPICS)
+        prayer_pool.warm(PREWARM_PRAYER_TYPES)
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await dashboard_scheduler.stop()
+    await invalidation_bus.stop()
+    if chapter_sync_task is not None:
+        chapter_sync_task.cancel()
+    for pool in (devotional_pool, prayer_pool, prayer_prompt_pool):
+        await pool.stop()
+    # Buffered inserts must reach Mongo before the client goes away
+    for buffer in (highlight_writes, status_writes):
+        await buffer.stop()
     client.close()
 
 
@@ -0,0 +1,268 @@
+"""
+Worship song search for Ayumi
+In-memory indexes over song titles and artist names: each query word is
+expanded against the catalog's word vocabulary (exact, prefix, trigram
+fuzzy for typos like "hilsong" or "oceons", and infix matches), then
+scored through word -> song postings with IDF weighting. A sorted prefix
+index serves as-you-type suggestions and an artist -> songs index serves
+artist pages. Built once on first use from worship_music_data.
+"""
+import heapq
+import math
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from math import ceil
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+from worship_music_data import WORSHIP_ARTISTS, WORSHIP_SONGS
+
+MIN_SIMILARITY = 0.3
+PREFIX_SIMILARITY = 0.8
+INFIX_SIMILARITY = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+# In multi-word queries, words in more than this share of songs (e.g.
+# "worship") only affect the final re-rank, not candidate collection
+COMMON_WORD_SHARE = 0.2
+# Title matches rank slightly above artist matches of the same quality
+FIELD_WEIGHTS = (("title", 1.0), ("artist_name", 0.9))
+
+
+def normalize(text: str) -> str:
+    """Case-fold, strip accents and reduce punctuation to single spaces"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    chars = [c if c.isalnum() else " " for c in text if not unicodedata.combining(c)]
+    return " ".join("".join(chars).split())
+
+
+def trigrams(word: str) -> FrozenSet[str]:
+    """Trigrams of a word, padded so its start and end count (as pg_trgm does)"""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(grams: FrozenSet[str], other: FrozenSet[str]) -> float:
+    """How much of the query's trigrams appear in other, blended with Jaccard"""
+    shared = len(grams & other)
+    return 0.6 * shared / len(grams) + 0.4 * shared / len(grams | other) if shared else 0.0
+
+
+class SongIndex:
+    """Word, trigram, prefix and artist indexes over a song catalog"""
+
+    def __init__(self, songs: Sequence[Dict[str, Any]], artists: Sequence[Dict[str, Any]] = ()):
+        self.songs = list(songs)
+        self._texts: List[Tuple[str, ...]] = []
+        self._word_ids: Dict[str, int] = {}
+        # word id -> doc_id * 2 + field index
+        self._postings: List[List[int]] = []
+        self._artist_songs: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for doc_id, song in enumerate(self.songs):
+            texts = tuple(normalize(song.get(field) or "") for field, _ in FIELD_WEIGHTS)
+            self._texts.append(texts)
+            for field, text in enumerate(texts):
+                for word in set(text.split()):
+                    word_id = self._word_ids.get(word)
+                    if word_id is None:
+                        word_id = self._word_ids[word] = len(self._postings)
+                        self._postings.append([])
+                    self._postings[word_id].append(doc_id * 2 + field)
+            self._artist_songs[song["artist_id"]].append(song)
+        self._doc_freq = [len({p >> 1 for p in postings}) for postings in self._postings]
+
+        # Trigram index over the vocabulary, which stays small as the catalog grows
+        self._words = list(self._word_ids)
+        self._word_grams = [trigrams(word) for word in self._words]
+        self._gram_words: Dict[str, List[int]] = defaultdict(list)
+        for word_id, grams in enumerate(self._word_grams):
+            for gram in grams:
+                self._gram_words[gram].append(word_id)
+        self._sorted_words = sorted(self._words)
+
+        # Every word-start suffix of a title or artist name, for suggestions
+        names: Dict[Tuple[str, str], str] = {(a["id"], "artist"): a["name"] for a in artists}
+        for song in self.songs:
+            names.setdefault((song["artist_id"], "artist"), song["artist_name"])
+            names[(song["id"], "song")] = song["title"]
+        entries = []
+        for (item_id, kind), name in names.items():
+            words = normalize(name).split()
+            for position in range(len(words)):
+                entries.append((" ".join(words[position:]), position, kind, item_id, name))
+        entries.sort()
+        self._prefix_keys = [entry[0] for entry in entries]
+        self._prefix_entries = entries
+        self._songs_by_id = {song["id"]: song for song in self.songs}
+
+    def artist_songs(self, artist_id: str) -> List[Dict[str, Any]]:
+        return self._artist_songs.get(artist_id, [])
+
+    def _rarest(self, grams) -> List[str]:
+        return sorted(grams, key=lambda g: len(self._gram_words.get(g, ())))
+
+    def _expand(self, word: str, as_prefix: bool) -> Dict[int, float]:
+        """Vocabulary words a query word may stand for, with a similarity each.
+
+        Words found in the vocabulary are taken as spelt; only unknown words
+        are matched fuzzily.
+        """
+        matches: Dict[int, float] = {}
+        exact = self._word_ids.get(word)
+        if as_prefix:
+            i = bisect_left(self._sorted_words, word)
+            for candidate in self._sorted_words[i:i + MAX_PREFIX_EXPANSIONS]:
+                if not candidate.startswith(word):
+                    break
+                matches[self._word_ids[candidate]] = PREFIX_SIMILARITY
+        if exact is None and len(word) >= 3:
+            grams = trigrams(word)
+            # A word sharing `needed` of the query's trigrams has one of the
+            # n - needed + 1 rarest, so only those postings are walked
+            ranked = self._rarest(grams)
+            needed = max(1, ceil(len(grams) * MIN_SIMILARITY))
+            candidates = set()
+            for gram in ranked[:len(ranked) - needed + 1]:
+                candidates.update(self._gram_words.get(gram, ()))
+            # Infix matches ("ake" in "maker") contain every unpadded trigram
+            interior = [word[i:i + 3] for i in range(len(word) - 2)]
+            candidates.update(self._gram_words.get(self._rarest(interior)[0], ()))
+            for word_id in candidates:
+                score = similarity(grams, self._word_grams[word_id])
+                if score < MIN_SIMILARITY and word in self._words[word_id]:
+                    score = INFIX_SIMILARITY
+                if score >= MIN_SIMILARITY and score > matches.get(word_id, 0.0):
+                    matches[word_id] = score
+        if exact is not None:
+            matches[exact] = 1.0
+        return matches
+
+    def _idf(self, word_id: int) -> float:
+        return math.log(1 + len(self.songs) / self._doc_freq[word_id])
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Songs ranked by title/artist similarity, best first.
+
+        Misspelt query words match fuzzily; the last word also matches as a
+        prefix, so partially typed queries find results.
+        """
+        query = normalize(query)
+        words = query.split()
+        if not words:
+            return []
+        expansions = [self._expand(word, as_prefix=i == len(words) - 1) for i, word in enumerate(words)]
+        common = len(self.songs) * COMMON_WORD_SHARE
+        if len(words) > 1 and any(
+            any(self._doc_freq[w] <= common for w in expanded) for expanded in expansions
+        ):
+            expansions = [{w: s for w, s in expanded.items() if self._doc_freq[w] <= common} for expanded in expansions]
+
+        scores: Dict[int, float] = defaultdict(float)
+        for expanded in expansions:
+            best: Dict[int, float] = {}
+            for word_id, word_score in expanded.items():
+                weighted = word_score * self._idf(word_id)
+                for posting in self._postings[word_id]:
+                    score = weighted * FIELD_WEIGHTS[posting & 1][1]
+                    doc_id = posting >> 1
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] += score
+
+        # Whole-query matches only need checking for the leading candidates
+        pool = heapq.nlargest(max(limit or 0, 20) * 3, scores.items(), key=lambda item: item[1])
+        ranked = []
+        for doc_id, score in pool:
+            bonus = 0.0
+            for text, (_, weight) in zip(self._texts[doc_id], FIELD_WEIGHTS):
+                if text == query:
+                    bonus = max(bonus, 1.0 * weight)
+                elif text.startswith(query):
+                    bonus = max(bonus, 0.5 * weight)
+                elif query in text:
+                    bonus = max(bonus, 0.25 * weight)
+            ranked.append((-(score / len(words) + bonus), self.songs[doc_id]["title"], doc_id))
+        ranked.sort()
+        return [self.songs[doc_id] for _, _, doc_id in ranked[:limit]]
+
+    def _prefix_matches(self, prefix: str, scan_limit: int = 200) -> Iterator[Tuple]:
+        i = bisect_left(self._prefix_keys, prefix)
+        end = min(len(self._prefix_keys), i + scan_limit)
+        while i < end and self._prefix_keys[i].startswith(prefix):
+            yield self._prefix_entries[i]
+            i += 1
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Song and artist suggestions for a partially typed query.
+
+        Names starting with the prefix come first, then names with a word
+        starting with it; fuzzy matches fill in when that is not enough.
+        """
+        query = normalize(prefix)
+        if not query:
+            return []
+        matches = {}
+        for _, position, kind, item_id, name in self._prefix_matches(query):
+            key = (kind, item_id)
+            rank = (position > 0, len(name), name)
+            if key not in matches or rank < matches[key][0]:
+                matches[key] = (rank, name)
+        ranked = sorted(matches.items(), key=lambda item: item[1][0])[:limit]
+        suggestions = [self._suggestion(kind, item_id, name) for (kind, item_id), (_, name) in ranked]
+        if len(suggestions) < limit and len(query) >= 3:
+            grams = trigrams(query)
+            for song in self.search(query, limit=limit):
+                fuzzy = [("song", song["id"], song["title"])]
+                # A misspelt artist name ("hilsong") should suggest the artist itself
+                if similarity(grams, trigrams(normalize(song["artist_name"]))) >= MIN_SIMILARITY:
+                    fuzzy.insert(0, ("artist", song["artist_id"], song["artist_name"]))
+                for kind, item_id, name in fuzzy:
+                    if (kind, item_id) not in matches and len(suggestions) < limit:
+                        matches[(kind, item_id)] = None
+                        suggestions.append(self._suggestion(kind, item_id, name))
+        return suggestions[:limit]
+
+    def _suggestion(self, kind: str, item_id: str, name: str) -> Dict[str, Any]:
+        suggestion = {"type": kind, "id": item_id, "text": name}
+        if kind == "song":
+            suggestion["artist_name"] = self._songs_by_id[item_id]["artist_name"]
+        return suggestion
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "songs": len(self.songs),
+            "artists": len(self._artist_songs),
+            "words": len(self._words),
+            "trigrams": len(self._gram_words),
+            "prefix_entries": len(self._prefix_keys),
+        }
+
+
+_index: Optional[SongIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_song_index() -> SongIndex:
+    """The index over the worship catalog, built on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SongIndex(WORSHIP_SONGS, WORSHIP_ARTISTS)
+    return _index
+
+
+def search_songs(query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Search songs by title or artist, best match first"""
+    return get_song_index().search(query, limit)
+
+
+def autocomplete(prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Suggest songs and artists for a partial query"""
+    return get_song_index().autocomplete(prefix, limit)
+
+
+def get_artist_songs(artist_id: str) -> List[Dict[str, Any]]:
+    """Get all songs by artist"""
+    return get_song_index().artist_songs(artist_id)
@@ -75,12 +75,3 @@ def get_all_artists():
 def get_all_songs():
     """Get all worship songs"""
     return WORSHIP_SONGS
-
-def search_songs(query: str):
-    """Search songs by title or artist"""
-    query_lower = query.lower()
-    return [s for s in WORSHIP_SONGS if query_lower in s["title"].lower() or query_lower in s["artist_name"].lower()]
-
-def get_artist_songs(artist_id: str):
-    """Get all songs by artist"""
-    return [s for s in WORSHIP_SONGS if s["artist_id"] == artist_id]
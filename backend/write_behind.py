@@ -0,0 +1,146 @@
+"""
+Write-behind insert buffer for Ayumi
+Groups single-document inserts from concurrent requests into insert_many
+batches, flushed when a batch fills up or a short interval passes.
+
+Callers choose how long to wait: with ack=True (the default) insert()
+returns once the batch containing the document has been written, so a
+request never reports success for data that is not in Mongo; with
+ack=False it returns as soon as the document is queued, and anything still
+buffered is lost if the process dies before the next flush.
+
+An optional on_written hook receives the documents of each batch that were
+actually inserted, after the waiting requests have been answered, so work
+derived from the inserts is batched too and never counts a failed insert.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_MAX_BATCH = int(os.getenv('WRITE_BEHIND_MAX_BATCH', '500'))
+WRITE_BEHIND_INTERVAL_MS = float(os.getenv('WRITE_BEHIND_INTERVAL_MS', '20'))
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv('WRITE_BEHIND_MAX_QUEUE', '10000'))
+
+
+class WriteBehindBuffer:
+    """Batches inserts into one collection"""
+
+    def __init__(self, collection, max_batch: int = WRITE_BEHIND_MAX_BATCH,
+                 interval_ms: float = WRITE_BEHIND_INTERVAL_MS,
+                 max_queue: int = WRITE_BEHIND_MAX_QUEUE,
+                 on_written: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None):
+        self._collection = collection
+        self._on_written = on_written
+        self.max_batch = max(1, max_batch)
+        self.interval = interval_ms / 1000.0
+        self.max_queue = max(self.max_batch, max_queue)
+        self._pending: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.max_depth = 0
+        self.flushes = 0
+        self.inserted = 0
+        self.failed = 0
+
+    async def insert(self, doc: Dict[str, Any], ack: bool = True) -> None:
+        """Queue a document; with ack, wait until it has been written.
+
+        Raises the write error for this document when ack is set.
+        """
+        if len(self._pending) >= self.max_queue:
+            # Back-pressure: write the backlog before accepting more
+            await self.flush()
+        future = asyncio.get_running_loop().create_future() if ack else None
+        self._pending.append((doc, future))
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._ensure_started()
+        self._wakeup.set()
+        if future is not None:
+            await asyncio.shield(future)
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            if self._flush_lock is None:
+                self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Give concurrent requests a moment to join the batch
+            deadline = asyncio.get_running_loop().time() + self.interval
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, 0.005))
+            # Shielded so stop() cannot cancel a batch halfway through its write
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        """Write everything queued so far"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                await self._write(batch)
+
+    async def _write(self, batch: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]]) -> None:
+        errors: Dict[int, Exception] = {}
+        try:
+            await self._collection.insert_many([doc for doc, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                errors[error["index"]] = RuntimeError(error.get("errmsg", "Write failed"))
+        except Exception as e:
+            errors = {i: e for i in range(len(batch))}
+        self.flushes += 1
+        self.failed += len(errors)
+        self.inserted += len(batch) - len(errors)
+        for i, (doc, future) in enumerate(batch):
+            error = errors.get(i)
+            if future is None:
+                if error is not None:
+                    logger.error(f"Write-behind insert into {self._collection.name} failed: {error}")
+            elif not future.done():
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+        written = [doc for i, (doc, _) in enumerate(batch) if i not in errors]
+        if self._on_written is not None and written:
+            try:
+                await self._on_written(written)
+            except Exception as e:
+                logger.error(f"Write-behind hook for {self._collection.name} failed: {e}")
+
+    async def stop(self) -> None:
+        """Flush whatever is buffered and stop the background flusher"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": len(self._pending),
+            "max_depth": self.max_depth,
+            "flushes": self.flushes,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "avg_batch": round((self.inserted + self.failed) / self.flushes, 2) if self.flushes else 0,
+        }
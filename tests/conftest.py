@@ -0,0 +1,8 @@
+"""
+Shared test setup
+Backend modules are imported flat, as server.py imports them.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
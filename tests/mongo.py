@@ -0,0 +1,34 @@
+"""
+Throwaway Mongo databases for tests
+Tests that need a server use MONGO_URL (default localhost) and are skipped
+when nothing answers there.
+"""
+import os
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+
+
+@asynccontextmanager
+async def scratch_db(replica_set: bool = False):
+    """A uniquely named database, dropped afterwards; skips the test if Mongo is unavailable"""
+    client = AsyncIOMotorClient(MONGO_URL, serverSelectionTimeoutMS=1000)
+    try:
+        hello = await client.admin.command("hello")
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f"No MongoDB at {MONGO_URL}: {e}")
+    if replica_set and "setName" not in hello:
+        client.close()
+        pytest.skip(f"MongoDB at {MONGO_URL} is not a replica set")
+    name = f"ayumi_test_{uuid.uuid4().hex[:12]}"
+    try:
+        yield client[name]
+    finally:
+        await client.drop_database(name)
+        client.close()
@@ -0,0 +1,53 @@
+"""
+In-process caches
+"""
+import time
+
+from cache import LRUCache, TTLCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_entries_expire():
+    cache = TTLCache(max_entries=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_fill_with_current_token_is_stored():
+    cache = TTLCache()
+    token = cache.token()
+    cache.set("user", {"theme": "dark"}, token)
+    assert cache.get("user") == {"theme": "dark"}
+
+
+def test_fill_racing_a_write_is_dropped():
+    cache = TTLCache()
+    token = cache.token()          # reader starts loading from Mongo
+    cache.set("user", "written")   # a write lands meanwhile
+    cache.set("user", "stale", token)
+    assert cache.get("user") == "written"
+
+
+def test_fill_racing_an_invalidation_is_dropped():
+    cache = TTLCache()
+    token = cache.token()
+    cache.pop("user")
+    cache.set("user", "stale", token)
+    assert cache.get("user") is None
+    token = cache.token()
+    cache.clear()
+    cache.set("user", "stale", token)
+    assert cache.get("user") is None
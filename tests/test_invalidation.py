@@ -0,0 +1,49 @@
+"""
+Change stream invalidation against a real replica set
+Start one with `mongod --replSet rs0` and `rs.initiate()`, then point
+MONGO_URL at it; skipped otherwise.
+"""
+import asyncio
+
+from invalidation import InvalidationBus
+from tests.mongo import scratch_db
+
+
+async def _wait_for(events, count, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while len(events) < count and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.05)
+    assert len(events) >= count, f"expected {count} events, got {events}"
+
+
+async def _chapter_events():
+    async with scratch_db(replica_set=True) as db:
+        await db.create_collection("bible_chapters")
+        changes, inserts = [], []
+        bus = InvalidationBus()
+        bus.attach(db)
+        bus.subscribe("bible_chapters", changes.append, on_insert=inserts.append,
+                      fields=("book", "chapter", "version"))
+        await bus.start()
+        try:
+            assert bus.mode == "change_streams"
+            await asyncio.sleep(0.5)  # let the watch open
+            verses = [{"verse": 16, "text": "For God so loved the world"}]
+            doc = {"key": "ESV:john:3", "book": "John", "chapter": 3, "version": "ESV", "verses": verses}
+            await db.bible_chapters.insert_one(doc)
+            await db.bible_chapters.update_one({"key": "ESV:john:3"}, {"$set": {"verses": verses * 2}})
+            await db.bible_chapters.delete_one({"key": "ESV:john:3"})
+            await _wait_for(changes, 2)
+        finally:
+            await bus.stop()
+        return inserts, changes
+
+
+def test_change_stream_routes_inserts_and_trims_updates():
+    inserts, changes = asyncio.run(_chapter_events())
+    # Inserts go to on_insert only, with the whole document
+    assert len(inserts) == 1
+    assert inserts[0]["verses"][0]["verse"] == 16
+    # Updates carry just the requested fields; deletes clear everything
+    assert changes[0] == {"book": "John", "chapter": 3, "version": "ESV"}
+    assert changes[1] is None
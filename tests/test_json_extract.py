@@ -0,0 +1,55 @@
+"""
+JSON extraction from LLM responses
+"""
+import pytest
+
+from json_extract import IncrementalJSONParser, extract_json, extract_json_payload
+
+
+def test_code_fence():
+    assert extract_json('```json\n{"a": 1}\n```') == {"a": 1}
+
+
+def test_leading_text():
+    assert extract_json('Here is the chapter:\n[{"verse": 1}]') == [{"verse": 1}]
+
+
+def test_trailing_text():
+    assert extract_json('{"a": [1, 2]}\n\nLet me know if you need more.') == {"a": [1, 2]}
+
+
+def test_braces_in_prose_are_skipped():
+    assert extract_json('Use {placeholders} like so: {"a": 1}') == {"a": 1}
+
+
+def test_longest_payload_wins():
+    assert extract_json('Example: {"x": 1}. Answer: {"a": 1, "b": [1, 2, 3]}') == {"a": 1, "b": [1, 2, 3]}
+
+
+def test_cut_off_array_salvages_complete_elements():
+    payload, complete = extract_json_payload('[{"verse": 1}, {"verse": 2}, {"verse": 3, "te')
+    assert payload == [{"verse": 1}, {"verse": 2}]
+    assert complete is False
+
+
+def test_cut_off_object_raises():
+    text = '{"date":"x","verse":{"text":"a","reference":"b"},"passage":{"text":"trunc'
+    with pytest.raises(ValueError):
+        extract_json_payload(text)
+
+
+def test_cut_off_object_with_nested_array_raises():
+    with pytest.raises(ValueError):
+        extract_json('{"reference": "John 3", "outline": ["a", "b"], "author": "Jo')
+
+
+def test_no_payload_raises():
+    with pytest.raises(ValueError):
+        extract_json("I cannot help with that.")
+
+
+def test_incremental_parser_emits_elements_as_they_complete():
+    parser = IncrementalJSONParser()
+    assert parser.feed('Sure: [{"verse": 1}, {"ver') == [{"verse": 1}]
+    assert parser.feed('se": 2}]') == [{"verse": 2}]
+    assert parser.complete and parser.value == [{"verse": 1}, {"verse": 2}]
@@ -0,0 +1,58 @@
+"""
+Keyset pagination cursors
+"""
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from pagination import clamp_limit, decode_cursor, encode_cursor, keyset_filter
+
+
+def _raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trips():
+    values = [datetime(2024, 5, 1, 12, 30, 15, 123000), "abc", 3, 1.5, None, True]
+    assert decode_cursor(encode_cursor(values), len(values)) == values
+
+
+@pytest.mark.parametrize("values", [
+    [{"$ne": None}, "x"],
+    [{"$gt": ""}, "x"],
+    [{"$date": "2024-01-01T00:00:00", "$ne": None}, "x"],
+    [{"$date": 5}, "x"],
+    [["a", "b"], "x"],
+    [[{"$ne": None}], "x"],
+])
+def test_operator_documents_and_arrays_are_rejected(values):
+    with pytest.raises(ValueError):
+        decode_cursor(_raw_cursor(values), 2)
+
+
+@pytest.mark.parametrize("cursor", ["not base64 !", _raw_cursor("x"), _raw_cursor(["only one"])])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+def test_keyset_filter_follows_sort_directions():
+    assert keyset_filter([("date", -1), ("id", -1)], ["2024-01-01", "b"]) == {"$or": [
+        {"date": {"$lt": "2024-01-01"}},
+        {"date": "2024-01-01", "id": {"$lt": "b"}},
+    ]}
+    assert keyset_filter([("created_at", 1)], [5]) == {"created_at": {"$gt": 5}}
+
+
+def test_clamp_limit():
+    assert clamp_limit(None, default=50) == 50
+    assert clamp_limit(5000, maximum=1000) == 1000
+    assert clamp_limit(1) == 1
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_limit_below_one_is_rejected(limit):
+    with pytest.raises(ValueError):
+        clamp_limit(limit)
@@ -0,0 +1,78 @@
+"""
+Single-flight request coalescing
+"""
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*[flights.do("key", fetch) for _ in range(5)])
+        return results, calls, flights.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert stats == {"in_flight": 0, "calls": 1, "coalesced": 4}
+
+
+def test_errors_reach_every_waiter():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        return await asyncio.gather(*[flights.do("key", fail) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) and str(r) == "upstream down" for r in results)
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    async def scenario():
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def fetch():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "value"
+
+        first = asyncio.create_task(flights.do("key", fetch))
+        await started.wait()
+        second = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, flights.stats()
+
+    value, stats = asyncio.run(scenario())
+    assert value == "value"
+    assert stats["calls"] == 1
+
+
+def test_finished_calls_are_not_reused():
+    async def scenario():
+        flights = SingleFlight()
+        counter = iter(range(10))
+
+        async def fetch():
+            return next(counter)
+
+        return await flights.do("key", fetch), await flights.do("key", fetch)
+
+    assert asyncio.run(scenario()) == (0, 1)
@@ -0,0 +1,81 @@
+"""
+Worship song search and autocomplete
+"""
+import pytest
+
+from song_index import SongIndex, normalize, search_songs, autocomplete
+
+SONGS = [
+    {"id": "s1", "title": "Oceans (Where Feet May Fail)", "artist_id": "hillsong", "artist_name": "Hillsong United"},
+    {"id": "s2", "title": "Way Maker", "artist_id": "sinach", "artist_name": "Sinach"},
+    {"id": "s3", "title": "Amazing Grace (My Chains Are Gone)", "artist_id": "tomlin", "artist_name": "Chris Tomlin"},
+    {"id": "s4", "title": "What a Beautiful Name", "artist_id": "hillsong", "artist_name": "Hillsong Worship"},
+    {"id": "s5", "title": "Graves Into Gardens", "artist_id": "elevation", "artist_name": "Elevation Worship"},
+]
+ARTISTS = [
+    {"id": "hillsong", "name": "Hillsong"},
+    {"id": "sinach", "name": "Sinach"},
+    {"id": "tomlin", "name": "Chris Tomlin"},
+    {"id": "elevation", "name": "Elevation Worship"},
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SongIndex(SONGS, ARTISTS)
+
+
+def _ids(songs):
+    return [song["id"] for song in songs]
+
+
+def test_normalize_folds_case_accents_and_punctuation():
+    assert normalize("  Déjà-Vu,  WORSHIP! ") == "deja vu worship"
+
+
+def test_exact_word_ranks_first(index):
+    assert _ids(index.search("oceans"))[0] == "s1"
+
+
+@pytest.mark.parametrize("query, expected", [("oceons", "s1"), ("way makr", "s2"), ("amazng grace", "s3")])
+def test_typos_still_match(index, query, expected):
+    assert _ids(index.search(query))[0] == expected
+
+
+def test_misspelt_artist_finds_their_songs(index):
+    assert set(_ids(index.search("hilsong"))[:2]) == {"s1", "s4"}
+
+
+def test_last_word_matches_as_prefix(index):
+    assert _ids(index.search("beautiful na"))[0] == "s4"
+
+
+def test_limit(index):
+    assert len(index.search("worship", limit=1)) == 1
+
+
+def test_unmatched_query_is_empty(index):
+    assert index.search("zzzzqqq") == []
+    assert index.search("   ") == []
+
+
+def test_autocomplete_prefers_names_starting_with_the_prefix(index):
+    suggestions = index.autocomplete("gra")
+    assert suggestions[0] == {"type": "song", "id": "s5", "text": "Graves Into Gardens",
+                              "artist_name": "Elevation Worship"}
+    assert "s3" in [s["id"] for s in suggestions]
+
+
+def test_autocomplete_suggests_a_misspelt_artist(index):
+    suggestions = index.autocomplete("hilsong")
+    assert suggestions[0]["type"] == "artist" and suggestions[0]["id"] == "hillsong"
+
+
+def test_artist_songs(index):
+    assert _ids(index.artist_songs("hillsong")) == ["s1", "s4"]
+    assert index.artist_songs("nobody") == []
+
+
+def test_catalog_wrappers_search_the_bundled_songs():
+    assert search_songs("oceans", limit=5)
+    assert autocomplete("hill")